@@ -1,5 +1,6 @@
 import json
 import os
+import time
 from datetime import datetime
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -9,6 +10,12 @@ import uuid
 from fastapi import Request
 from fastapi.responses import StreamingResponse, JSONResponse
 import asyncio
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:  # Optional: only /video_feed/mosaic needs them
+    cv2 = None
 # ==================== Configuration ====================
 DB_FILE = "db.json"
 DEFAULT_ADMIN_USER = {
@@ -386,6 +393,39 @@ def create_alert(alert: Alert):
 def get_alerts():
     db = read_db()
     return db.get("alerts", [])
+# ==================== STREAM DEMAND ====================
+# Edge nodes only need to encode and upload at full rate while a dashboard is
+# actually watching. Each /video_feed* stream counts itself as a viewer, and
+# every upload response tells the edge what rate/quality is wanted right now.
+
+STREAM_FPS = 10          # The feed generators below emit one frame per 0.1 s
+KEEPALIVE_FPS = 1        # Nobody watching: keep the last frame fresh, and notice new viewers within ~1 s
+KEEPALIVE_QUALITY = 40
+viewer_counts = {1: 0, 2: 0, 3: 0}
+frame_versions = {1: 0, 2: 0, 3: 0}  # Bumped on every upload, so composites know what changed
+
+def stream_hint(camera: int) -> dict:
+    """What the edge node for `camera` should send. wanted_quality None = the edge's own setting."""
+    viewers = viewer_counts[camera]
+    if viewers > 0:
+        return {"viewers": viewers, "wanted_fps": STREAM_FPS, "wanted_quality": None}
+    return {"viewers": 0, "wanted_fps": KEEPALIVE_FPS, "wanted_quality": KEEPALIVE_QUALITY}
+
+async def counted_stream(camera: int, frames):
+    """Wraps a frame generator so the camera's viewer count covers exactly the stream's lifetime."""
+    viewer_counts[camera] += 1
+    try:
+        async for chunk in frames:
+            yield chunk
+    finally:
+        # Runs when the browser disconnects and Starlette closes the generator
+        viewer_counts[camera] -= 1
+
+@app.get("/viewers", tags=["Video"])
+def get_viewers():
+    """Current viewer count and upload hint for every camera."""
+    return {str(camera): stream_hint(camera) for camera in viewer_counts}
+
 # ==================== VIDEO STREAMING LOGIC ====================
 
 latest_frame = b""
@@ -394,7 +434,8 @@ latest_frame = b""
 async def upload_frame(request: Request):
     global latest_frame
     latest_frame = await request.body()
-    return {"status": "success"}
+    frame_versions[1] += 1
+    return {"status": "success", **stream_hint(1)}
 
 async def frame_generator():
     global latest_frame
@@ -411,7 +452,7 @@ async def video_feed():
         return JSONResponse(status_code=404, content={"message": "Waiting for drone feed..."})
         
     return StreamingResponse(
-        frame_generator(), 
+        counted_stream(1, frame_generator()),
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
 # ==================== ESP8266 HARDWARE TRIGGER ====================
@@ -444,7 +485,8 @@ latest_frame_2 = b""
 async def upload_frame_2(request: Request):
     global latest_frame_2
     latest_frame_2 = await request.body()
-    return {"status": "success"}
+    frame_versions[2] += 1
+    return {"status": "success", **stream_hint(2)}
 
 async def frame_generator_2():
     global latest_frame_2
@@ -458,7 +500,7 @@ async def frame_generator_2():
 async def video_feed_2():
     if not latest_frame_2:
         return JSONResponse(status_code=404, content={"message": "Waiting for Camera 2..."})
-    return StreamingResponse(frame_generator_2(), media_type="multipart/x-mixed-replace; boundary=frame")
+    return StreamingResponse(counted_stream(2, frame_generator_2()), media_type="multipart/x-mixed-replace; boundary=frame")
 
 # ==================== CAMERA 3 LOGIC (NOTE DETECTION) ====================
 latest_frame_3 = b""
@@ -467,7 +509,8 @@ latest_frame_3 = b""
 async def upload_frame_3(request: Request):
     global latest_frame_3
     latest_frame_3 = await request.body()
-    return {"status": "success"}
+    frame_versions[3] += 1
+    return {"status": "success", **stream_hint(3)}
 
 async def frame_generator_3():
     global latest_frame_3
@@ -481,7 +524,234 @@ async def frame_generator_3():
 async def video_feed_3():
     if not latest_frame_3:
         return JSONResponse(status_code=404, content={"message": "Waiting for Camera 3..."})
-    return StreamingResponse(frame_generator_3(), media_type="multipart/x-mixed-replace; boundary=frame")
+    return StreamingResponse(counted_stream(3, frame_generator_3()), media_type="multipart/x-mixed-replace; boundary=frame")
+
+# ==================== MOSAIC STREAM ====================
+# One MJPEG stream with every camera tiled into a grid, for wall displays and
+# dashboards that would otherwise hold one connection per camera. Each layout
+# is composited by a single shared Mosaic, only when one of its cameras has
+# uploaded a new frame, so adding viewers costs no extra decoding or encoding.
+#
+#   /video_feed/mosaic                          all cameras, 320x240 tiles, square-ish grid
+#   /video_feed/mosaic?cameras=2,1&cols=2&tile_width=480&tile_height=270
+
+MOSAIC_CAMERAS = [1, 2, 3]
+MOSAIC_TILE_SIZE = (320, 240)
+MOSAIC_MAX_TILE_SIZE = (1280, 720)
+MOSAIC_QUALITY = 70
+MOSAIC_KEEPALIVE_SECONDS = 1.0  # Resend an unchanged mosaic this often so browsers don't time out
+
+def camera_frame(camera: int) -> bytes:
+    return {1: latest_frame, 2: latest_frame_2, 3: latest_frame_3}[camera]
+
+class Mosaic:
+    """The latest composite JPEG of one layout, shared by every viewer of that layout."""
+
+    def __init__(self, cameras, cols, tile_size):
+        self.cameras = cameras
+        self.cols = cols
+        self.tile_size = tile_size
+        self.rows = -(-len(cameras) // cols)
+        self.tiles = {}          # camera -> (frame version, resized BGR tile)
+        self.versions = None     # Input versions the current jpeg was built from
+        self.jpeg = b""
+        self.version = 0         # Bumped whenever jpeg changes
+        self.viewers = 0
+        self.lock = asyncio.Lock()
+
+    def _tile(self, camera):
+        version = frame_versions[camera]
+        cached = self.tiles.get(camera)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        w, h = self.tile_size
+        data = camera_frame(camera)
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) if data else None
+        if image is None:
+            tile = np.zeros((h, w, 3), np.uint8)
+            cv2.putText(tile, "Waiting for feed...", (10, h // 2), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        else:
+            tile = cv2.resize(image, (w, h), interpolation=cv2.INTER_AREA)
+        cv2.putText(tile, f"CAM {camera}", (8, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+        self.tiles[camera] = (version, tile)
+        return tile
+
+    def _compose(self):
+        """Returns (jpeg, the frame versions its tiles were built from)."""
+        w, h = self.tile_size
+        canvas = np.zeros((self.rows * h, self.cols * w, 3), np.uint8)
+        for i, camera in enumerate(self.cameras):
+            row, col = divmod(i, self.cols)
+            canvas[row * h:(row + 1) * h, col * w:(col + 1) * w] = self._tile(camera)
+        versions = tuple(self.tiles[c][0] for c in self.cameras)
+        ok, buffer = cv2.imencode(".jpg", canvas, [cv2.IMWRITE_JPEG_QUALITY, MOSAIC_QUALITY])
+        return (buffer.tobytes() if ok else self.jpeg), versions
+
+    def _stale(self):
+        return tuple(frame_versions[c] for c in self.cameras) != self.versions
+
+    async def latest(self):
+        """The current composite, rebuilt first if any camera uploaded since the last build."""
+        if self._stale():
+            async with self.lock:  # The first viewer to notice rebuilds; the rest wait and reuse it
+                # Checked again now: a viewer that waited here may find the rebuild already done
+                if self._stale():
+                    # Decode/resize/encode off the event loop so uploads keep flowing
+                    self.jpeg, self.versions = await asyncio.to_thread(self._compose)
+                    self.version += 1
+        return self.version, self.jpeg
+
+mosaics = {}  # (cameras, cols, tile_size) -> Mosaic with at least one viewer
+
+async def mosaic_generator(mosaic: Mosaic):
+    mosaic.viewers += 1
+    sent_version, sent_at = None, 0.0
+    try:
+        while True:
+            version, jpeg = await mosaic.latest()
+            now = time.monotonic()
+            if jpeg and (version != sent_version or now - sent_at >= MOSAIC_KEEPALIVE_SECONDS):
+                yield (b'--frame\r\n'
+                       b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+                sent_version, sent_at = version, now
+            await asyncio.sleep(1 / STREAM_FPS)
+    finally:
+        mosaic.viewers -= 1
+        if mosaic.viewers == 0:
+            mosaics.pop((mosaic.cameras, mosaic.cols, mosaic.tile_size), None)
+
+@app.get("/video_feed/mosaic", tags=["Video"])
+async def video_feed_mosaic(cameras: Optional[str] = None, cols: Optional[int] = None,
+                            tile_width: int = MOSAIC_TILE_SIZE[0], tile_height: int = MOSAIC_TILE_SIZE[1]):
+    """All cameras (or `cameras`, e.g. "2,1") tiled `cols` wide into a single MJPEG stream."""
+    if cv2 is None:
+        return JSONResponse(status_code=503, content={"message": "Mosaic needs opencv-python-headless on the server"})
+    try:
+        selected = tuple(int(c) for c in cameras.split(",")) if cameras else tuple(MOSAIC_CAMERAS)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cameras must look like 1,2,3")
+    if not selected or any(c not in frame_versions for c in selected):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"cameras must be from {sorted(frame_versions)}")
+    cols = max(1, min(cols or -(-len(selected) // int(len(selected) ** 0.5)), len(selected)))
+    tile_size = (max(16, min(tile_width, MOSAIC_MAX_TILE_SIZE[0])), max(16, min(tile_height, MOSAIC_MAX_TILE_SIZE[1])))
+
+    key = (selected, cols, tile_size)
+    mosaic = mosaics.get(key)
+    if mosaic is None:
+        mosaic = mosaics[key] = Mosaic(selected, cols, tile_size)
+
+    # Watching the mosaic counts as watching each camera in it, so the edges stream at full rate
+    frames = mosaic_generator(mosaic)
+    for camera in selected:
+        frames = counted_stream(camera, frames)
+    return StreamingResponse(frames, media_type="multipart/x-mixed-replace; boundary=frame")
+
+# ==================== SERVER-SIDE INFERENCE ====================
+# Optional: thin camera nodes (edge_node.py --infer-on-server N) post raw frames
+# to /infer_frame/N, and a pool of worker processes runs the usual detectors on
+# them (edge_runtime/inference_pool.py). Annotated frames replace camera N's
+# feed; alerts reach /alerts through the plugins' own AlertClient, as from any
+# edge node. Upload responses carry each camera's fair-share fps, so thin nodes
+# slow down instead of piling up frames when the workers are saturated.
+#
+#   SPARK_INFERENCE=1 SPARK_INFERENCE_WORKERS=4 python main.py
+
+INFERENCE_ENABLED = os.environ.get("SPARK_INFERENCE") == "1"
+INFERENCE_WORKERS = int(os.environ.get("SPARK_INFERENCE_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+INFERENCE_BATCH_SIZE = 4
+INFERENCE_PLUGINS = {1: ["pose", "objects"], 2: ["face"], 3: ["drawer"]}  # Camera -> detectors
+INFERENCE_SELF_URL = "http://127.0.0.1:8000"  # Where the workers post alerts and telemetry
+inference_pool = None
+
+def set_camera_frame(camera: int, jpeg: bytes):
+    global latest_frame, latest_frame_2, latest_frame_3
+    if camera == 1:
+        latest_frame = jpeg
+    elif camera == 2:
+        latest_frame_2 = jpeg
+    else:
+        latest_frame_3 = jpeg
+    frame_versions[camera] += 1
+
+@app.on_event("startup")
+async def start_inference_pool():
+    global inference_pool
+    if not INFERENCE_ENABLED:
+        return
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+    from edge_runtime.inference_pool import InferencePool
+
+    inference_pool = InferencePool(
+        INFERENCE_PLUGINS, INFERENCE_SELF_URL, workers=INFERENCE_WORKERS, batch_size=INFERENCE_BATCH_SIZE,
+        on_result=lambda camera, jpeg, alerts, received: set_camera_frame(camera, jpeg)
+    )
+    print(f"🧠 Server-side inference: {INFERENCE_WORKERS} workers for cameras {sorted(INFERENCE_PLUGINS)}")
+
+@app.on_event("shutdown")
+async def stop_inference_pool():
+    if inference_pool:
+        inference_pool.close()
+
+@app.post("/infer_frame/{camera}", tags=["Inference"])
+async def infer_frame(camera: int, request: Request):
+    if inference_pool is None:
+        return JSONResponse(status_code=503, content={"message": "Server-side inference is off (set SPARK_INFERENCE=1)"})
+    if camera not in INFERENCE_PLUGINS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No detectors configured for camera {camera}")
+    accepted = inference_pool.submit(camera, await request.body())
+    return {"status": "queued" if accepted else "replaced", "viewers": viewer_counts[camera],
+            **inference_pool.hint(camera)}
+
+@app.get("/inference", tags=["Inference"])
+def get_inference():
+    """Worker health and per-camera throughput, drops, queue depth and latency."""
+    if inference_pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **inference_pool.stats()}
+
+# ==================== EDGE TELEMETRY ====================
+# Edge nodes push per-stage latency histograms, fps and CPU/memory every ~10 s
+# (edge_runtime/telemetry.py). Kept in memory: only the latest report per node matters.
+
+TELEMETRY_STALE_SECONDS = 30
+node_telemetry = {}
+
+@app.post("/telemetry", tags=["Telemetry"])
+async def post_telemetry(request: Request):
+    report = await request.json()
+    node = str(report.get("node", "unknown"))
+    node_telemetry[node] = {**report, "received_at": time.time()}
+    return {"status": "success"}
+
+@app.get("/telemetry", tags=["Telemetry"])
+def get_telemetry():
+    """Health of every edge node: online/stale, fps, the stage limiting it, and CPU/memory."""
+    now = time.time()
+    nodes = []
+    for node, report in sorted(node_telemetry.items()):
+        age = now - report["received_at"]
+        stages = report.get("stages", {})
+        bottleneck = report.get("bottleneck")
+        nodes.append({
+            "node": node,
+            "status": "online" if age < TELEMETRY_STALE_SECONDS else "stale",
+            "last_report_s": round(age, 1),
+            "fps": report.get("fps"),
+            "bottleneck": bottleneck,
+            "bottleneck_ms_per_frame": stages.get(bottleneck, {}).get("ms_per_frame") if bottleneck else None,
+            "system": report.get("system", {}),
+        })
+    return nodes
+
+@app.get("/telemetry/{node}", tags=["Telemetry"])
+def get_node_telemetry(node: str):
+    """The full latest report of one node, including every stage's histogram."""
+    if node not in node_telemetry:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No telemetry from node '{node}'")
+    return node_telemetry[node]
 
 # ==================== CASHIER STATUS LOGIC ====================
 current_cashier_status = "SCANNING..."
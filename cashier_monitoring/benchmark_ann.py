@@ -0,0 +1,66 @@
+import argparse
+import time
+
+import numpy as np
+
+from face_module.ann_index import AnnFaceGallery
+from face_module.gallery import FaceGallery
+
+
+def synthetic_database(people, per_person, dim=512, noise=0.35, seed=0):
+    """Fake roster: each person is a random direction plus per-photo noise."""
+    rng = np.random.default_rng(seed)
+    centers = FaceGallery.normalize(rng.normal(size=(people, dim)))
+    database = {}
+    for p in range(people):
+        photos = centers[p] + noise * rng.normal(size=(per_person, dim)) / np.sqrt(dim)
+        database[f"person_{p:05d}"] = FaceGallery.normalize(photos)
+    return database, centers
+
+
+def time_queries(gallery, queries, top_k):
+    start = time.perf_counter()
+    results = [gallery.match(q, top_k=top_k)[0] for q in queries]
+    elapsed = time.perf_counter() - start
+    return results, elapsed * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall/latency of the ANN face index against exact matching")
+    parser.add_argument("--people", type=int, default=5000)
+    parser.add_argument("--per-person", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=1)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--storage", choices=["int8", "float16", "float32"], default="int8")
+    args = parser.parse_args()
+
+    database, centers = synthetic_database(args.people, args.per_person)
+    rng = np.random.default_rng(1)
+    picked = rng.integers(len(centers), size=args.queries)
+    queries = FaceGallery.normalize(centers[picked] + 0.35 * rng.normal(size=(args.queries, centers.shape[1])) / np.sqrt(centers.shape[1]))
+
+    exact = FaceGallery(database)
+    exact_results, exact_ms = time_queries(exact, queries, args.top_k)
+    exact_bytes = exact.matrix.nbytes / len(exact)
+    print(f"Exact      : {exact_ms:7.3f} ms/query | {exact_bytes:8.0f} B/identity")
+
+    build_start = time.perf_counter()
+    ann = AnnFaceGallery(database, storage=args.storage)
+    build_s = time.perf_counter() - build_start
+    ann_bytes = ann.index.nbytes() / len(ann)
+    print(f"ANN build  : {build_s:7.2f} s  | {ann.index.n_lists} lists | {args.storage}")
+
+    for n_probe in args.n_probe:
+        ann.index.n_probe = n_probe
+        ann_results, ann_ms = time_queries(ann, queries, args.top_k)
+        hits = sum(
+            1 for a, e in zip(ann_results, exact_results)
+            if [p for p, _ in a] == [p for p, _ in e]
+        )
+        print(f"ANN probe {n_probe:<2}: {ann_ms:7.3f} ms/query | {ann_bytes:8.0f} B/identity | "
+              f"recall@{args.top_k} vs exact {hits / len(queries):.3f}")
+
+
+if __name__ == "__main__":
+    main()
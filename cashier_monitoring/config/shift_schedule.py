@@ -1,16 +1,159 @@
+import bisect
+import json
+import os
+import threading
+import time
 from datetime import datetime
 
+# Fallback roster, used when config/shifts.json is missing: every day, the default register
 shift_schedule = {
     "09:00-13:00": "aditi",
     "14:00-18:00": "aadil"
 }
 
-def get_current_shift_person():
-    now = datetime.now().strftime("%H:%M")
+ROSTER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shifts.json")
+DEFAULT_REGISTER = "default"
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+MINUTES_PER_DAY = 24 * 60
 
-    for time_range, person in shift_schedule.items():
-        start, end = time_range.split("-")
-        if start <= now <= end:
-            return person
 
-    return None
\ No newline at end of file
+def _parse_minutes(hhmm):
+    hours, minutes = hhmm.strip().split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _parse_days(days):
+    if days in (None, "daily", "*"):
+        return list(range(7))
+    if isinstance(days, str):
+        days = [days]
+    return [WEEKDAYS.index(day.strip().lower()[:3]) for day in days]
+
+
+def _compile_day(intervals):
+    """Turns possibly-overlapping (start, end, person) minute intervals into a
+    sorted breakpoint list plus the set of people on duty from each breakpoint on."""
+    events = sorted({0, MINUTES_PER_DAY} | {m for start, end, _ in intervals for m in (start, end)})
+    on_duty = []
+    for point in events[:-1]:
+        on_duty.append(tuple(sorted(
+            person for start, end, person in intervals if start <= point < end
+        )))
+    return events[:-1], on_duty
+
+
+def compile_roster(roster):
+    """Compiles {register: [{"days", "time", "person"}, ...]} into a
+    {(register, weekday): (breakpoints, on_duty)} lookup table.
+
+    Shift ends are inclusive to the minute ("09:00-13:00" still covers 13:00),
+    and a shift whose end is before its start runs overnight into the next day.
+    """
+    raw = {}
+    for register, entries in roster.items():
+        for entry in entries:
+            start_text, end_text = entry["time"].split("-")
+            start = _parse_minutes(start_text)
+            end = _parse_minutes(end_text) + 1
+            person = entry["person"]
+
+            for day in _parse_days(entry.get("days")):
+                if end > start:
+                    raw.setdefault((register, day), []).append((start, end, person))
+                else:
+                    next_day = (day + 1) % 7
+                    raw.setdefault((register, day), []).append((start, MINUTES_PER_DAY, person))
+                    raw.setdefault((register, next_day), []).append((0, end, person))
+
+    return {key: _compile_day(intervals) for key, intervals in raw.items()}
+
+
+class ShiftSchedule:
+    """Answers "who is authorized at register X right now" from a roster file.
+
+    The roster is compiled once into a sorted interval index per register and
+    weekday, so a lookup is one bisect. The file is re-read automatically when
+    its modification time changes, checked at most every `reload_interval`
+    seconds, so rosters can be edited without restarting the node.
+    """
+
+    def __init__(self, path=ROSTER_FILE, reload_interval=1.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._index = {}
+        self._mtime = None
+        self._last_check = 0.0
+        self.reload()
+
+    def reload(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        try:
+            if mtime is None:
+                roster = {DEFAULT_REGISTER: [
+                    {"days": "daily", "time": time_range, "person": person}
+                    for time_range, person in shift_schedule.items()
+                ]}
+            else:
+                with open(self.path, "r") as f:
+                    roster = json.load(f)["registers"]
+            index = compile_roster(roster)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # Keep serving the last good roster while someone is mid-edit; this file
+            # version isn't retried, the next save (new mtime) is
+            print("Shift roster error:", e)
+            with self._lock:
+                self._mtime = mtime
+            return
+
+        with self._lock:
+            self._index = index
+            self._mtime = mtime
+
+    def _maybe_reload(self):
+        now = time.time()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            self.reload()
+
+    def authorized(self, register=DEFAULT_REGISTER, when=None):
+        """Tuple of everyone on shift at `register` at `when` (default: now)."""
+        self._maybe_reload()
+        when = when or datetime.now()
+
+        with self._lock:
+            entry = self._index.get((register, when.weekday()))
+        if entry is None:
+            return ()
+
+        breakpoints, on_duty = entry
+        minute = when.hour * 60 + when.minute
+        return on_duty[bisect.bisect_right(breakpoints, minute) - 1]
+
+    def is_authorized(self, person, register=DEFAULT_REGISTER, when=None):
+        person = person.lower()
+        return any(p.lower() == person for p in self.authorized(register, when))
+
+
+_schedule = None
+
+
+def get_schedule():
+    global _schedule
+    if _schedule is None:
+        _schedule = ShiftSchedule()
+    return _schedule
+
+
+def get_current_shift_person(register=DEFAULT_REGISTER):
+    on_duty = get_schedule().authorized(register)
+    return on_duty[0] if on_duty else None
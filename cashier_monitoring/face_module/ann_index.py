@@ -0,0 +1,201 @@
+import numpy as np
+
+from face_module.gallery import FaceGallery
+
+
+def _kmeans(vectors, k, iterations=10, seed=0):
+    """Spherical k-means on unit vectors. Returns (k, dim) unit centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        for c in range(k):
+            members = vectors[assignment == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+            else:
+                # Re-seed empty clusters so every list stays useful
+                centroids[c] = vectors[rng.integers(len(vectors))]
+        centroids = FaceGallery.normalize(centroids)
+
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index over unit vectors with compressed storage.
+
+    Vectors are bucketed by their nearest k-means centroid; a query only scans
+    the `n_probe` closest buckets. Each bucket stores its vectors as int8 (with
+    a per-vector scale) or float16, which cuts memory per embedding to a
+    quarter or a half of float32.
+    """
+
+    def __init__(self, dim, n_lists=16, n_probe=4, storage="int8"):
+        if storage not in ("int8", "float16", "float32"):
+            raise ValueError(f"Unsupported storage type: {storage}")
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.storage = storage
+        self.centroids = np.zeros((1, dim), dtype=np.float32)
+        self._reset_lists()
+
+    def _reset_lists(self):
+        n = len(self.centroids)
+        self.codes = [np.zeros((0, self.dim), dtype=self.storage) for _ in range(n)]
+        self.scales = [np.zeros(0, dtype=np.float32) for _ in range(n)]
+        self.ids = [np.zeros(0, dtype=np.int64) for _ in range(n)]
+        self.where = {}  # item id -> (list, position)
+
+    def __len__(self):
+        return len(self.where)
+
+    def train(self, vectors):
+        """Learns the bucket centroids and re-buckets anything already stored."""
+        vectors = FaceGallery.normalize(vectors)
+        ids, stored = self._all_items()
+
+        k = min(self.n_lists, len(vectors))
+        self.centroids = _kmeans(vectors, k) if k > 1 else np.zeros((1, self.dim), dtype=np.float32)
+        self._reset_lists()
+        if len(ids):
+            self.add(ids, stored)
+
+    def _encode(self, vectors):
+        if self.storage == "int8":
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+            return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+        return vectors.astype(self.storage), np.ones(len(vectors), dtype=np.float32)
+
+    def _decode(self, lst):
+        return self.codes[lst].astype(np.float32) * self.scales[lst][:, None]
+
+    def _all_items(self):
+        ids = np.concatenate(self.ids)
+        vectors = np.concatenate([self._decode(i) for i in range(len(self.codes))])
+        return ids, vectors
+
+    def add(self, ids, vectors):
+        vectors = FaceGallery.normalize(vectors).reshape(-1, self.dim)
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        buckets = np.argmax(vectors @ self.centroids.T, axis=1)
+
+        for lst in np.unique(buckets):
+            sel = buckets == lst
+            codes, scales = self._encode(vectors[sel])
+            start = len(self.ids[lst])
+            self.codes[lst] = np.concatenate([self.codes[lst], codes])
+            self.scales[lst] = np.concatenate([self.scales[lst], scales])
+            self.ids[lst] = np.concatenate([self.ids[lst], ids[sel]])
+            for offset, item_id in enumerate(ids[sel]):
+                self.where[int(item_id)] = (int(lst), start + offset)
+
+    def remove(self, item_id):
+        """Removes one item by swapping the last entry of its bucket into its slot."""
+        lst, pos = self.where.pop(int(item_id))
+        last = len(self.ids[lst]) - 1
+        if pos != last:
+            self.codes[lst][pos] = self.codes[lst][last]
+            self.scales[lst][pos] = self.scales[lst][last]
+            self.ids[lst][pos] = self.ids[lst][last]
+            self.where[int(self.ids[lst][pos])] = (lst, pos)
+        self.codes[lst] = self.codes[lst][:last]
+        self.scales[lst] = self.scales[lst][:last]
+        self.ids[lst] = self.ids[lst][:last]
+
+    def search(self, queries, k=1, n_probe=None):
+        """Returns (ids, similarities) arrays of shape (num_queries, k); missing slots have id -1."""
+        queries = FaceGallery.normalize(np.atleast_2d(queries))
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :n_probe]
+
+        out_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        out_sims = np.full((len(queries), k), -np.inf, dtype=np.float32)
+
+        for q, query in enumerate(queries):
+            lists = [lst for lst in probes[q] if len(self.ids[lst])]
+            if not lists:
+                continue
+
+            codes = np.concatenate([self.codes[lst] for lst in lists])
+            scales = np.concatenate([self.scales[lst] for lst in lists])
+            ids = np.concatenate([self.ids[lst] for lst in lists])
+
+            # Score straight off the compressed codes; the scale is applied after the dot product
+            sims = (codes.astype(np.float32) @ query) * scales
+
+            top = min(k, len(sims))
+            best = np.argpartition(-sims, top - 1)[:top]
+            best = best[np.argsort(-sims[best])]
+            out_ids[q, :top] = ids[best]
+            out_sims[q, :top] = sims[best]
+
+        return out_ids, out_sims
+
+    def nbytes(self):
+        return sum(c.nbytes for c in self.codes) + sum(s.nbytes for s in self.scales) + sum(i.nbytes for i in self.ids)
+
+
+class AnnFaceGallery:
+    """Drop-in alternative to FaceGallery backed by an IVFIndex.
+
+    Suited to chain-wide galleries of thousands of people; people can be added
+    or removed without rebuilding.
+    """
+
+    def __init__(self, database, n_lists=None, n_probe=4, storage="int8", rows_per_person=8):
+        embeddings = [np.asarray(e, dtype=np.float32) for rows in database.values() for e in rows]
+        self.dim = len(embeddings[0]) if embeddings else 512
+        self.rows_per_person = rows_per_person
+        self.labels = {}       # item id -> person
+        self.person_ids = {}   # person -> [item id, ...]
+        self.next_id = 0
+
+        # Roughly sqrt(N) buckets keeps both the centroid scan and each bucket small
+        n_lists = n_lists or max(1, int(np.sqrt(len(embeddings))))
+        self.index = IVFIndex(self.dim, n_lists=n_lists, n_probe=n_probe, storage=storage)
+        if embeddings:
+            self.index.train(np.stack(embeddings))
+
+        for person, rows in database.items():
+            self.add_person(person, rows)
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    def add_person(self, person, embeddings):
+        if len(embeddings) == 0:
+            return
+        ids = np.arange(self.next_id, self.next_id + len(embeddings))
+        self.next_id += len(embeddings)
+        self.index.add(ids, np.asarray(embeddings, dtype=np.float32))
+        for item_id in ids:
+            self.labels[int(item_id)] = person
+        self.person_ids.setdefault(person, []).extend(int(i) for i in ids)
+
+    def remove_person(self, person):
+        for item_id in self.person_ids.pop(person, []):
+            self.index.remove(item_id)
+            del self.labels[item_id]
+
+    def match(self, embeddings, top_k=1):
+        """Same contract as FaceGallery.match: up to `top_k` (person, distance) pairs per face."""
+        # Pull extra rows so several embeddings of one person don't crowd out the runner-up
+        ids, sims = self.index.search(embeddings, k=top_k * self.rows_per_person)
+
+        results = []
+        for id_row, sim_row in zip(ids, sims):
+            matches, seen = [], set()
+            for item_id, sim in zip(id_row, sim_row):
+                if item_id < 0:
+                    break
+                person = self.labels[int(item_id)]
+                if person in seen:
+                    continue
+                seen.add(person)
+                matches.append((person, float(1.0 - sim)))
+                if len(matches) == top_k:
+                    break
+            results.append(matches)
+        return results
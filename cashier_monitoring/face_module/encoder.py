@@ -1,28 +1,108 @@
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 from deepface import DeepFace
 
 
-def build_face_database(dataset_path="dataset"):
-    face_db = {}
+def _represent(img_path, model_name):
+    """Runs in a worker process: embeds one image."""
+    return DeepFace.represent(
+        img_path=img_path,
+        model_name=model_name,
+        enforce_detection=False
+    )[0]["embedding"]
+
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _cache_paths(dataset_path, model_name):
+    base = os.path.join(dataset_path, f"embeddings_{model_name.lower()}")
+    return base + ".npy", base + ".json"
+
+
+def _load_cache(dataset_path, model_name):
+    """Returns ({image hash: row}, memory-mapped matrix) or empty values if there is no usable cache."""
+    matrix_path, index_path = _cache_paths(dataset_path, model_name)
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+        matrix = np.load(matrix_path, mmap_mode="r")
+        if index.get("model_name") == model_name and len(index["rows"]) == len(matrix):
+            return index["rows"], matrix
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}, None
+
+
+def _save_cache(dataset_path, model_name, rows, matrix):
+    matrix_path, index_path = _cache_paths(dataset_path, model_name)
+
+    # Write to temp files first so a crash mid-write never leaves a torn cache behind
+    with open(matrix_path + ".tmp", "wb") as f:
+        np.save(f, matrix)
+    with open(index_path + ".tmp", "w") as f:
+        json.dump({"model_name": model_name, "rows": rows}, f)
 
-    for person in os.listdir(dataset_path):
+    os.replace(matrix_path + ".tmp", matrix_path)
+    os.replace(index_path + ".tmp", index_path)
+
+
+def build_face_database(dataset_path="dataset", model_name="Facenet512", workers=None):
+    """Builds {person: [embedding, ...]} for every image under dataset/<person>/.
+
+    Embeddings are cached on disk next to the dataset, keyed by image content
+    hash, so only new or changed images go through DeepFace. Those are
+    computed in parallel across a process pool.
+    """
+    images = []  # (person, hash, path)
+    for person in sorted(os.listdir(dataset_path)):
         person_path = os.path.join(dataset_path, person)
 
         if os.path.isdir(person_path):
-            embeddings = []
-
-            for img_name in os.listdir(person_path):
+            for img_name in sorted(os.listdir(person_path)):
                 img_path = os.path.join(person_path, img_name)
+                images.append((person, _file_hash(img_path), img_path))
+
+    cached_rows, matrix = _load_cache(dataset_path, model_name)
+
+    missing = {}
+    for _, img_hash, img_path in images:
+        if img_hash not in cached_rows and img_hash not in missing:
+            missing[img_hash] = img_path
 
-                embedding = DeepFace.represent(
-                    img_path=img_path,
-                    model_name="Facenet512",
-                    enforce_detection=False
-                )[0]["embedding"]
+    stale = set(cached_rows) - {img_hash for _, img_hash, _ in images}
 
-                embeddings.append(embedding)
+    if missing or stale:
+        print(f"🧠 Embedding {len(missing)} new image(s), dropping {len(stale)} removed...")
 
-            face_db[person] = embeddings
+        paths = list(missing.values())
+        if len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                new_embeddings = list(pool.map(_represent, paths, [model_name] * len(paths)))
+        else:
+            new_embeddings = [_represent(path, model_name) for path in paths]
+
+        # Rebuild the matrix with only the rows still in use, then the new ones
+        keep = [h for h in cached_rows if h not in stale]
+        kept_matrix = np.asarray(matrix[[cached_rows[h] for h in keep]], dtype=np.float32) if keep else None
+        del matrix
+
+        parts = [m for m in (kept_matrix, np.asarray(new_embeddings, dtype=np.float32)) if m is not None and len(m)]
+        new_matrix = np.concatenate(parts) if parts else np.zeros((0, 0), dtype=np.float32)
+        new_rows = {h: i for i, h in enumerate(keep + list(missing))}
+
+        _save_cache(dataset_path, model_name, new_rows, new_matrix)
+        cached_rows, matrix = _load_cache(dataset_path, model_name)
+
+    face_db = {}
+    for person, img_hash, _ in images:
+        face_db.setdefault(person, []).append(matrix[cached_rows[img_hash]])
 
     print("✅ Face embeddings generated successfully.")
-    return face_db
\ No newline at end of file
+    return face_db
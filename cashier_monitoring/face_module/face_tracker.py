@@ -0,0 +1,106 @@
+import math
+
+import cv2
+import numpy as np
+
+from edge_runtime.tracking import BoxTracker
+
+
+class FaceIdentity:
+    def __init__(self, person, distance, confidence, confirmed_at):
+        self.person = person          # Matched person, or None if nobody in the gallery was close enough
+        self.distance = distance
+        self.confidence = confidence  # Confidence right after the embedding; decays from here
+        self.confirmed_at = confirmed_at
+
+
+class FaceTrackPipeline:
+    """Cheap face detection + tracking that decides which faces need embedding.
+
+    Faces are found with a Haar cascade on a downscaled grayscale frame and
+    followed with a BoxTracker. The expensive embedding model then only runs on
+    the crop of a track that is new, or whose identity confidence has decayed,
+    so a cashier sitting at the counter all shift is re-verified now and then
+    rather than re-identified every pass.
+    """
+
+    def __init__(self, threshold=0.4, detect_scale=0.5, detect_every=3, half_life=60.0,
+                 min_confidence=0.5, pad=0.25):
+        self.cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+        self.tracker = BoxTracker(iou_threshold=0.3, high_score=0.0, max_misses=5)
+        self.threshold = threshold
+        self.detect_scale = detect_scale
+        self.detect_every = detect_every
+        self.half_life = half_life          # Seconds for identity confidence to halve
+        self.min_confidence = min_confidence
+        self.pad = pad                      # Extra margin around the Haar box, as a fraction of its size
+        self.identities = {}                # track id -> FaceIdentity
+        self.frame_count = 0
+        self.tracks = []
+
+    def detect(self, frame):
+        """Face boxes (x1, y1, x2, y2) in full-frame coordinates."""
+        small = cv2.resize(frame, None, fx=self.detect_scale, fy=self.detect_scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.equalizeHist(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY))
+        faces = self.cascade.detectMultiScale(gray, scaleFactor=1.15, minNeighbors=5, minSize=(24, 24))
+        if len(faces) == 0:
+            return np.zeros((0, 4), dtype=np.float32)
+
+        faces = np.asarray(faces, dtype=np.float32) / self.detect_scale
+        faces[:, 2:] += faces[:, :2]
+        return faces
+
+    def update(self, frame):
+        self.frame_count += 1
+        if self.frame_count % self.detect_every == 1 or self.detect_every == 1:
+            boxes = self.detect(frame)
+            self.tracks = self.tracker.update(boxes, np.ones(len(boxes)), np.zeros(len(boxes), dtype=int))
+        else:
+            self.tracks = self.tracker.predict()
+
+        # Forget identities of tracks the tracker has dropped
+        alive = {t.track_id for t in self.tracker.tracks}
+        for track_id in list(self.identities):
+            if track_id not in alive:
+                del self.identities[track_id]
+
+        return self.tracks
+
+    def confidence(self, track_id, now):
+        identity = self.identities.get(track_id)
+        if identity is None:
+            return 0.0
+        return identity.confidence * math.pow(0.5, (now - identity.confirmed_at) / self.half_life)
+
+    def needs_embedding(self, now):
+        # Only faces the last detection confirmed; a coasting track's box may no longer hold a face
+        return [t for t in self.tracks if t.misses == 0 and self.confidence(t.track_id, now) < self.min_confidence]
+
+    def crop(self, frame, track):
+        h, w = frame.shape[:2]
+        x1, y1, x2, y2 = track.box
+        pad_x, pad_y = (x2 - x1) * self.pad, (y2 - y1) * self.pad
+        x1, y1 = int(max(0, x1 - pad_x)), int(max(0, y1 - pad_y))
+        x2, y2 = int(min(w, x2 + pad_x)), int(min(h, y2 + pad_y))
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return frame[y1:y2, x1:x2].copy()
+
+    def assign(self, track_id, person, distance, now):
+        if distance < self.threshold:
+            # A close match starts near 1.0; an unknown face is re-checked much sooner
+            confidence = 1.0 - 0.5 * (distance / self.threshold)
+            self.identities[track_id] = FaceIdentity(person, distance, confidence, now)
+        else:
+            self.identities[track_id] = FaceIdentity(None, distance, 0.6, now)
+
+    def primary_track(self):
+        """The largest (closest) face, taken to be the person at the register."""
+        if not self.tracks:
+            return None
+        return max(self.tracks, key=lambda t: (t.box[2] - t.box[0]) * (t.box[3] - t.box[1]))
+
+    def primary_identity(self):
+        """FaceIdentity of the primary track, or None while that face hasn't been embedded yet."""
+        track = self.primary_track()
+        return self.identities.get(track.track_id) if track else None
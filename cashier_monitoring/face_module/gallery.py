@@ -0,0 +1,65 @@
+import numpy as np
+
+
+class FaceGallery:
+    """Face database held as one L2-normalised float32 matrix.
+
+    Every stored embedding is a row; `row_labels` maps each row back to an
+    index into `labels`. Rows of the same person are kept contiguous so the
+    best match per person can be taken with a single reduceat.
+    """
+
+    def __init__(self, database):
+        self.labels = []
+        rows = []
+        row_labels = []
+
+        for person, embeddings in database.items():
+            if len(embeddings) == 0:
+                continue
+            self.labels.append(person)
+            rows.extend(embeddings)
+            row_labels.extend([len(self.labels) - 1] * len(embeddings))
+
+        self.matrix = self.normalize(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+        self.row_labels = np.asarray(row_labels, dtype=np.int32)
+        self.label_starts = np.flatnonzero(np.r_[True, np.diff(self.row_labels) != 0]) if rows else np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.labels)
+
+    @staticmethod
+    def normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def distances(self, embeddings):
+        """Cosine distance from each live embedding to each person (best of their stored rows).
+
+        Returns an array of shape (num_faces, num_people).
+        """
+        queries = self.normalize(np.atleast_2d(embeddings))
+        if len(self.labels) == 0:
+            return np.ones((len(queries), 0), dtype=np.float32)
+
+        row_distances = 1.0 - queries @ self.matrix.T
+        return np.minimum.reduceat(row_distances, self.label_starts, axis=1)
+
+    def match(self, embeddings, top_k=1):
+        """Returns, for each live embedding, a list of up to `top_k` (person, distance) pairs, nearest first."""
+        distances = self.distances(embeddings)
+        k = min(top_k, distances.shape[1])
+        if k == 0:
+            return [[] for _ in range(len(distances))]
+
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearest_distances = np.take_along_axis(nearest_distances, order, axis=1)
+
+        return [
+            [(self.labels[i], float(d)) for i, d in zip(idx_row, dist_row)]
+            for idx_row, dist_row in zip(nearest, nearest_distances)
+        ]
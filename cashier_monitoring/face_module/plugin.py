@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import requests
+
+from config.shift_schedule import get_schedule
+from edge_runtime.runtime import Plugin
+from utils.logger import log_alert
+
+
+class FacePlugin(Plugin):
+    """Cashier authentication inside EdgeRuntime; also pushes the register status to the dashboard.
+
+    FaceRecognizer already paces its own DeepFace work (background worker,
+    face tracks), so this runs every frame and only reads the clean image.
+    """
+
+    name = "face"
+    active_every = 1
+    idle_every = 1
+
+    def __init__(self, recognizer, status_url=None, snapshots=None):
+        super().__init__()
+        self.recognizer = recognizer
+        self.status_url = status_url
+        self.snapshots = snapshots  # Optional SnapshotStore for UNAUTHORIZED evidence
+        self.last_status_time = 0
+        self.current_status = "SCANNING..."
+
+    def process(self, frame):
+        _, auth_status = self.recognizer.recognize_faces(frame.image, canvas=frame.canvas, now=frame.time)
+
+        # If auth_status is None (still booting up), default to SCANNING
+        new_status = auth_status if auth_status else "SCANNING..."
+
+        # Only once a face has actually been matched: an empty counter also reads as UNAUTHORIZED,
+        # and a tracked face that hasn't been embedded yet has an empty match list
+        if self.snapshots:
+            if new_status == "UNAUTHORIZED" and any(self.recognizer.last_matches):
+                self.save_snapshot(frame)
+            self.snapshots.maybe_flush(frame.time)
+
+        if not self.status_url:
+            self.current_status = new_status
+            return
+
+        # Send Status to Dashboard (Max 1 update per second)
+        if frame.time - self.last_status_time > 1.0 or new_status != self.current_status:
+            try:
+                requests.post(self.status_url, json={"status": new_status}, timeout=0.5)
+                self.last_status_time = frame.time
+                self.current_status = new_status
+            except:
+                pass  # Silently drop network errors
+
+    def save_snapshot(self, frame):
+        when = datetime.fromtimestamp(frame.time)
+        expected = ", ".join(get_schedule().authorized(self.recognizer.register, when)) or None
+        person = self.recognizer.last_detected_person
+        # The store drops repeats of the same scene, so only new incidents reach the log
+        if self.snapshots.save(frame.canvas, person=person, expected=expected, now=frame.time):
+            log_alert(person, expected, when.strftime("%Y%m%d_%H%M%S"))
+
+    def close(self):
+        self.recognizer.close()
+        if self.snapshots:
+            self.snapshots.close()
+        if self.status_url:
+            try:
+                requests.post(self.status_url, json={"status": "OFFLINE"}, timeout=0.5)
+            except:
+                pass
@@ -1,79 +1,193 @@
 import os
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 
+import time
 import cv2
-import numpy as np
 from deepface import DeepFace
-from config.shift_schedule import get_current_shift_person
+from config.shift_schedule import DEFAULT_REGISTER, get_schedule
+from face_module.gallery import FaceGallery
+from face_module.ann_index import AnnFaceGallery
+from face_module.worker import LatestFrameWorker
+from face_module.face_tracker import FaceTrackPipeline
 from datetime import datetime
 
 
 class FaceRecognizer:
-    def __init__(self, database):
+    def __init__(self, database, use_ann=False, background=True, min_interval=0.5, track_faces=True,
+                 register=DEFAULT_REGISTER, clock=time.time):
         self.database = database
+        self.clock = clock  # Also decides which shift is on; replays pass a fixed clock
+        # The approximate index only pays off for chain-wide galleries of thousands of people
+        self.gallery = AnnFaceGallery(database) if use_ann else FaceGallery(database)
+        self.register = register  # Which register's roster decides AUTHORIZED
         self.model_name = "Facenet512"
         self.frame_count = 0
-        self.skip_frames = 20  # Run detection every 20 frames
+        self.skip_frames = 20  # Inline mode only: run detection every 20 frames
         self.last_detected_person = None
         self.last_status = None
         self.threshold = 0.4
+        self.last_matches = []  # Top-k (person, distance) list for every face in the last pass
+
+        # Background mode: DeepFace runs on a worker thread, started again as soon as
+        # it is free (but no closer together than min_interval), so the video never stalls
+        self.min_interval = min_interval
+        self.last_submit_time = 0.0
+        self.seen_result_count = 0
+        analyze = self.embed_tracks if track_faces else self.analyze
+        self.worker = LatestFrameWorker(analyze) if background else None
+
+        # Tracked mode: only new faces, or faces whose identity has gone stale, are embedded
+        self.face_tracks = FaceTrackPipeline(threshold=self.threshold) if track_faces else None
+
+    def analyze(self, frame):
+        """One full detection + matching pass. Returns (detected_person, status, matches)."""
+        representation = DeepFace.represent(
+            img_path=frame,
+            model_name=self.model_name,
+            enforce_detection=False
+        )
+
+        if len(representation) == 0:
+            return "UNKNOWN PERSON", "UNAUTHORIZED", []
+
+        # Match every face in the frame with one matrix product
+        live_embeddings = [face["embedding"] for face in representation]
+        matches = self.gallery.match(live_embeddings, top_k=3)
+
+        # The first face DeepFace returns decides the register status
+        best = matches[0]
+        matched_person, min_distance = best[0] if best else (None, float("inf"))
+
+        if min_distance < self.threshold:
+            if get_schedule().is_authorized(matched_person, self.register, self._when()):
+                return matched_person, "AUTHORIZED", matches
+            return matched_person, "UNAUTHORIZED", matches
+
+        return "UNKNOWN PERSON", "UNAUTHORIZED", matches
+
+    def embed_tracks(self, job):
+        """Embeds cropped faces. `job` is [(track_id, crop), ...]; returns [(track_id, person, distance), ...]."""
+        track_ids, embeddings = [], []
+        for track_id, crop in job:
+            # The crop is already a face, so skip DeepFace's own (slow) detector
+            representation = DeepFace.represent(
+                img_path=crop,
+                model_name=self.model_name,
+                detector_backend="skip",
+                enforce_detection=False
+            )
+            track_ids.append(track_id)
+            embeddings.append(representation[0]["embedding"])
+
+        if not embeddings:
+            return []
+
+        results = []
+        for track_id, matches in zip(track_ids, self.gallery.match(embeddings, top_k=1)):
+            person, distance = matches[0] if matches else (None, float("inf"))
+            results.append((track_id, person, distance))
+        return results
+
+    def _when(self):
+        return datetime.fromtimestamp(self.clock())
+
+    def _status_for(self, person):
+        if person is None:
+            return "UNKNOWN PERSON", "UNAUTHORIZED"
+        if get_schedule().is_authorized(person, self.register, self._when()):
+            return person, "AUTHORIZED"
+        return person, "UNAUTHORIZED"
+
+    def _recognize_tracked(self, frame, canvas, now):
+        tracks = self.face_tracks.update(frame)
+
+        if self.worker:
+            result_count, result = self.worker.latest()
+            if result_count != self.seen_result_count:
+                self.seen_result_count = result_count
+                for track_id, person, distance in result:
+                    self.face_tracks.assign(track_id, person, distance, now)
+
+        pending = self.face_tracks.needs_embedding(now)
+        if pending and (self.worker is None or not self.worker.busy):
+            job = []
+            for track in pending:
+                crop = self.face_tracks.crop(frame, track)
+                if crop is not None:
+                    job.append((track.track_id, crop))
+
+            if self.worker:
+                if job and now - self.last_submit_time >= self.min_interval and self.worker.submit(job):
+                    self.last_submit_time = now
+            else:
+                try:
+                    for track_id, person, distance in self.embed_tracks(job):
+                        self.face_tracks.assign(track_id, person, distance, now)
+                except Exception as e:
+                    print("Detection error:", e)
+
+        # Tracks coast through missed Haar detections, so this only empties once the tracker
+        # has really dropped the face; until then the track keeps its identity and status
+        if not tracks:
+            self.last_detected_person, self.last_status = "UNKNOWN PERSON", "UNAUTHORIZED"
+        else:
+            identity = self.face_tracks.primary_identity()
+            if identity:
+                self.last_detected_person, self.last_status = self._status_for(identity.person)
+            else:
+                # A new face at the register (say, a cashier handover) isn't embedded yet:
+                # show it as pending, never with the previous person's name or status
+                self.last_detected_person, self.last_status = None, "SCANNING..."
+
+        self.last_matches = [
+            [(identity.person, identity.distance)] if identity else []
+            for identity in (self.face_tracks.identities.get(t.track_id) for t in tracks)
+        ]
+
+        for track in tracks:
+            identity = self.face_tracks.identities.get(track.track_id)
+            x1, y1, x2, y2 = map(int, track.box)
+            label = (identity.person or "UNKNOWN") if identity else "..."
+            cv2.rectangle(canvas, (x1, y1), (x2, y2), (255, 255, 0), 2)
+            cv2.putText(canvas, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+
+    def recognize_faces(self, frame, canvas=None, now=None):
+        """Recognizes faces in `frame` and draws the results on `canvas` (default: `frame` itself)."""
+        if canvas is None:
+            canvas = frame
+        now = self.clock() if now is None else now
+        self.frame_count += 1
 
-    def cosine_distance(self, emb1, emb2):
-        emb1 = np.array(emb1)
-        emb2 = np.array(emb2)
-        return 1 - np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
+        if self.face_tracks:
+            self._recognize_tracked(frame, canvas, now)
 
-    def recognize_faces(self, frame):
-        self.frame_count += 1
+        elif self.worker:
+            if now - self.last_submit_time >= self.min_interval and self.worker.submit(frame):
+                self.last_submit_time = now
 
-        if self.frame_count % self.skip_frames == 0:
-            try:
-                representation = DeepFace.represent(
-                    img_path=frame,
-                    model_name=self.model_name,
-                    enforce_detection=False
-                )
-
-                if len(representation) == 0:
-                    self.last_detected_person = "UNKNOWN PERSON"
-                    self.last_status = "UNAUTHORIZED"
-                else:
-                    live_embedding = representation[0]["embedding"]
-
-                    min_distance = float("inf")
-                    matched_person = None
-
-                    for person, embeddings in self.database.items():
-                        for db_embedding in embeddings:
-                            distance = self.cosine_distance(live_embedding, db_embedding)
-
-                            if distance < min_distance:
-                                min_distance = distance
-                                matched_person = person
-
-                    if min_distance < self.threshold:
-                        authorized_person = get_current_shift_person()
-
-                        self.last_detected_person = matched_person
-
-                        if authorized_person and matched_person.lower() == authorized_person.lower():
-                            self.last_status = "AUTHORIZED"
-                        else:
-                            self.last_status = "UNAUTHORIZED"
-                    else:
-                        self.last_detected_person = "UNKNOWN PERSON"
-                        self.last_status = "UNAUTHORIZED"
+            result_count, result = self.worker.latest()
+            if result_count != self.seen_result_count:
+                self.seen_result_count = result_count
+                self.last_detected_person, self.last_status, self.last_matches = result
 
+        elif self.frame_count % self.skip_frames == 0:
+            try:
+                self.last_detected_person, self.last_status, self.last_matches = self.analyze(frame)
             except Exception as e:
                 print("Detection error:", e)
 
-        if self.last_detected_person:
-            color = (0, 255, 0) if self.last_status == "AUTHORIZED" else (0, 0, 255)
+        if self.last_status:
+            color = {"AUTHORIZED": (0, 255, 0), "UNAUTHORIZED": (0, 0, 255)}.get(self.last_status, (0, 255, 255))
 
-            cv2.putText(frame, self.last_status, (20, 40),
+            cv2.putText(canvas, self.last_status, (20, 40),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
 
-            cv2.putText(frame, self.last_detected_person, (20, 80),
+        if self.last_detected_person:
+            cv2.putText(canvas, self.last_detected_person, (20, 80),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
 
-        return frame, self.last_status
\ No newline at end of file
+        return canvas, self.last_status
+
+    def close(self):
+        if self.worker:
+            self.worker.close()
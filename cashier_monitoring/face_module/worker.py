@@ -0,0 +1,75 @@
+import threading
+import time
+
+
+class LatestFrameWorker:
+    """Runs `fn(frame)` on a background thread, always on the newest frame.
+
+    The capture loop calls `submit()` and never blocks: if the worker is still
+    busy the frame is simply not taken. Finished results are published through
+    `latest()` together with a counter, so the caller can tell when a fresh one
+    has arrived. A job can be any object with `.copy()`, such as a list of
+    face crops.
+    """
+
+    def __init__(self, fn, name="face-recognition"):
+        self.fn = fn
+        self._cond = threading.Condition()
+        self._pending = None
+        self._busy = False
+        self._running = True
+        self._result = None
+        self._result_count = 0
+        self.last_duration = 0.0  # Seconds the last job took
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self):
+        with self._cond:
+            return self._busy or self._pending is not None
+
+    def submit(self, frame):
+        """Hands a frame to the worker. Returns False (and drops it) if the worker is busy."""
+        with self._cond:
+            if self._busy or self._pending is not None:
+                return False
+            self._pending = frame.copy()
+            self._cond.notify()
+            return True
+
+    def latest(self):
+        """Returns (result_count, result) for the newest finished job."""
+        with self._cond:
+            return self._result_count, self._result
+
+    def close(self, timeout=2.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                frame, self._pending = self._pending, None
+                self._busy = True
+
+            start = time.time()
+            try:
+                result = self.fn(frame)
+            except Exception as e:
+                print("Detection error:", e)
+                result = None
+
+            with self._cond:
+                self._busy = False
+                self.last_duration = time.time() - start
+                if result is not None:
+                    self._result = result
+                    self._result_count += 1
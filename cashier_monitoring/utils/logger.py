@@ -1,5 +1,18 @@
+import atexit
+import os
+
+LOG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alerts", "alerts_log.txt")
+
+# Opened once and line-buffered: each alert is on disk as soon as it is written
+_log = None
+
+
 def log_alert(detected_person, expected_person, timestamp):
-    with open("alerts/alerts_log.txt", "a") as f:
-        f.write(
-            f"[{timestamp}] Unauthorized detected: {detected_person} | Expected: {expected_person}\n"
-        )
\ No newline at end of file
+    global _log
+    if _log is None:
+        os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+        _log = open(LOG_FILE, "a", buffering=1)
+        atexit.register(_log.close)
+    _log.write(
+        f"[{timestamp}] Unauthorized detected: {detected_person} | Expected: {expected_person}\n"
+    )
@@ -0,0 +1,329 @@
+import argparse
+import glob
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+# Alert snapshots on disk, with an index to find them again and limits so the
+# folder can't fill the edge laptop. One incident used to leave dozens of near
+# identical full-size JPEGs; now it leaves one, plus a repeat count.
+
+ALERTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alerts")
+THUMB_DIR = "thumbs"
+INDEX_FILE = "snapshots.db"
+STAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    last_ts REAL NOT NULL,
+    camera TEXT NOT NULL,
+    person TEXT,
+    expected TEXT,
+    status TEXT,
+    path TEXT NOT NULL,
+    thumb TEXT,
+    bytes INTEGER NOT NULL,
+    phash INTEGER NOT NULL,
+    repeats INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_ts ON snapshots (ts);
+CREATE INDEX IF NOT EXISTS idx_snapshots_person_ts ON snapshots (person, ts);
+CREATE INDEX IF NOT EXISTS idx_snapshots_camera_ts ON snapshots (camera, ts);
+"""
+
+# Filenames the old save code left behind: alert_20260220_122952.jpg, unauthorized_20260221_122920.jpg
+LEGACY_NAME = re.compile(r"^(?:alert|unauthorized)_(\d{8}_\d{6})\.jpg$")
+LEGACY_LOG_LINE = re.compile(r"^\[(\d{8}_\d{6})\] Unauthorized detected: (.*?) \| Expected: (.*)$")
+
+
+def dhash(image, size=8):
+    """64-bit difference hash: which neighbouring pixels get brighter in a 9x8 grayscale thumbnail.
+
+    Survives JPEG noise, small lighting changes and a person shifting slightly,
+    so two snapshots of the same scene land a few bits apart.
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class SnapshotStore:
+    """Writes alert snapshots with thumbnails, indexes them in SQLite and prunes old ones.
+
+    A snapshot within `dedupe_seconds` of an earlier one from the same camera
+    and person, and no more than `dedupe_distance` bits away from it, is not
+    written again; the earlier row's `repeats` and `last_ts` are bumped
+    instead. Those bumps are counted in memory and written in one
+    transaction when the entry expires or every `flush_seconds`, so a long
+    incident costs no disk writes per frame. Retention drops whole
+    snapshots, oldest first, once they are older than `max_age_days` or the
+    store is over `max_mb`.
+    """
+
+    def __init__(self, root=ALERTS_DIR, camera="cam1", max_mb=500, max_age_days=30,
+                 dedupe_seconds=120, dedupe_distance=6, thumb_width=160, quality=85, flush_seconds=30):
+        self.root = root
+        self.camera = camera
+        self.max_bytes = int(max_mb * 2**20)
+        self.max_age_seconds = max_age_days * 86400
+        self.dedupe_seconds = dedupe_seconds
+        self.dedupe_distance = dedupe_distance
+        self.thumb_width = thumb_width
+        self.quality = quality
+        self.flush_seconds = flush_seconds
+
+        os.makedirs(os.path.join(root, THUMB_DIR), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(root, INDEX_FILE))
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+        # (camera, person) -> [[id, last_ts, phash, unsaved repeats]] of recent snapshots, for dedupe without a query
+        self.recent = {}
+        self.unsaved = []  # Expired entries whose repeats still need writing
+        self.last_flush = None  # In the caller's clock (frame.time), set by the first maybe_flush()
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(bytes), 0) FROM snapshots").fetchone()[0]
+
+    # --- Saving ---
+    def _duplicate_of(self, key, phash, now):
+        recent = []
+        for entry in self.recent.get(key, []):
+            if now - entry[1] <= self.dedupe_seconds:
+                recent.append(entry)
+            elif entry[3]:
+                self.unsaved.append(entry)
+        self.recent[key] = recent
+        for entry in recent:
+            if hamming(phash, entry[2]) <= self.dedupe_distance:
+                entry[1] = now  # A long incident keeps its window open
+                entry[3] += 1
+                return entry[0]
+        return None
+
+    def flush(self):
+        """Writes the repeat counts gathered in memory since the last flush."""
+        pending = self.unsaved + [entry for entries in self.recent.values() for entry in entries if entry[3]]
+        if pending:
+            self.db.executemany("UPDATE snapshots SET repeats = repeats + ?, last_ts = ? WHERE id = ?",
+                                [(entry[3], entry[1], entry[0]) for entry in pending])
+            self.db.commit()
+            for entry in pending:
+                entry[3] = 0
+        self.unsaved = []
+
+    def maybe_flush(self, now=None):
+        """Flushes if `flush_seconds` have passed; cheap enough to call every frame."""
+        now = time.time() if now is None else now
+        if self.last_flush is None:
+            self.last_flush = now
+        elif now - self.last_flush >= self.flush_seconds:
+            self.flush()
+            self.last_flush = now
+
+    def _filename(self, status, camera, now):
+        stamp = datetime.fromtimestamp(now).strftime(STAMP_FORMAT)
+        name = f"{status.lower()}_{camera}_{stamp}"
+        path, n = name, 1
+        while os.path.exists(os.path.join(self.root, path + ".jpg")):
+            n += 1
+            path = f"{name}_{n}"
+        return path + ".jpg"
+
+    def save(self, image, person=None, expected=None, status="UNAUTHORIZED", camera=None, now=None):
+        """Stores `image` unless it repeats a recent snapshot. Returns the new row as a dict, or None."""
+        camera = camera or self.camera
+        now = time.time() if now is None else now
+        phash = dhash(image)
+
+        duplicate = self._duplicate_of((camera, person), phash, now)
+        if self.unsaved:  # An incident just ended; record its final count now
+            self.flush()
+        if duplicate is not None:
+            self.maybe_flush(now)
+            return None
+
+        name = self._filename(status, camera, now)
+        ok, data = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            return None
+        h, w = image.shape[:2]
+        thumb_h = max(1, round(h * self.thumb_width / w))
+        thumb = cv2.resize(image, (self.thumb_width, thumb_h), interpolation=cv2.INTER_AREA)
+        _, thumb_data = cv2.imencode(".jpg", thumb, [cv2.IMWRITE_JPEG_QUALITY, 70])
+
+        thumb_name = os.path.join(THUMB_DIR, name)
+        with open(os.path.join(self.root, name), "wb") as f:
+            f.write(data.tobytes())
+        with open(os.path.join(self.root, thumb_name), "wb") as f:
+            f.write(thumb_data.tobytes())
+
+        size = len(data) + len(thumb_data)
+        row = {"ts": now, "last_ts": now, "camera": camera, "person": person, "expected": expected,
+               "status": status, "path": name, "thumb": thumb_name, "bytes": size,
+               "phash": phash - 2**64 if phash >= 2**63 else phash, "repeats": 0}  # SQLite integers are signed
+        row["id"] = self.db.execute(
+            "INSERT INTO snapshots (ts, last_ts, camera, person, expected, status, path, thumb, bytes, phash, repeats) "
+            "VALUES (:ts, :last_ts, :camera, :person, :expected, :status, :path, :thumb, :bytes, :phash, :repeats)",
+            row).lastrowid
+        self.db.commit()
+        self.total_bytes += size
+        self.recent.setdefault((camera, person), []).append([row["id"], now, phash, 0])
+
+        self.enforce_retention(now)
+        return row
+
+    # --- Querying ---
+    def query(self, since=None, until=None, person=None, camera=None, limit=100):
+        """Snapshots newest first, filtered by time range (epoch seconds), person and camera."""
+        self.flush()
+        where, args = [], []
+        if since is not None:
+            where.append("ts >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("ts < ?")
+            args.append(until)
+        if person is not None:
+            where.append("person = ?")
+            args.append(person)
+        if camera is not None:
+            where.append("camera = ?")
+            args.append(camera)
+        sql = "SELECT * FROM snapshots"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC LIMIT ?"
+        return [dict(row) for row in self.db.execute(sql, args + [limit])]
+
+    def stats(self):
+        self.flush()
+        row = self.db.execute("SELECT COUNT(*), COALESCE(SUM(repeats), 0), MIN(ts), MAX(ts) FROM snapshots").fetchone()
+        return {"snapshots": row[0], "deduplicated": row[1], "oldest": row[2], "newest": row[3],
+                "mb": round(self.total_bytes / 2**20, 1)}
+
+    # --- Retention ---
+    def _delete(self, rows):
+        for row in rows:
+            for name in (row["path"], row["thumb"]):
+                if name:
+                    try:
+                        os.remove(os.path.join(self.root, name))
+                    except FileNotFoundError:
+                        pass
+            self.total_bytes -= row["bytes"]
+        self.db.executemany("DELETE FROM snapshots WHERE id = ?", [(row["id"],) for row in rows])
+
+    def enforce_retention(self, now=None):
+        """Deletes snapshots past the age limit, then the oldest ones until under the size limit."""
+        now = time.time() if now is None else now
+        removed = 0
+
+        expired = self.db.execute("SELECT id, path, thumb, bytes FROM snapshots WHERE ts < ?",
+                                  (now - self.max_age_seconds,)).fetchall()
+        self._delete(expired)
+        removed += len(expired)
+
+        while self.total_bytes > self.max_bytes:
+            oldest = self.db.execute("SELECT id, path, thumb, bytes FROM snapshots ORDER BY ts LIMIT 64").fetchall()
+            if not oldest:
+                self.total_bytes = 0
+                break
+            for row in oldest:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self._delete([row])
+                removed += 1
+
+        if removed:
+            self.db.commit()
+        return removed
+
+    # --- Legacy files ---
+    def adopt_legacy(self, log_path=None):
+        """Indexes the unmanaged alert_*/unauthorized_*.jpg files so retention covers them too.
+
+        Person and expected cashier come from alerts_log.txt lines with the same
+        timestamp. No thumbnails or dedupe: the files are taken as they are.
+        """
+        people = {}
+        log_path = log_path or os.path.join(self.root, "alerts_log.txt")
+        if os.path.exists(log_path):
+            with open(log_path) as f:
+                for line in f:
+                    match = LEGACY_LOG_LINE.match(line.strip())
+                    if match:
+                        people[match.group(1)] = (match.group(2), match.group(3))
+
+        known = {row[0] for row in self.db.execute("SELECT path FROM snapshots")}
+        rows = []
+        for path in sorted(glob.glob(os.path.join(self.root, "*.jpg"))):
+            name = os.path.basename(path)
+            match = LEGACY_NAME.match(name)
+            if not match or name in known:
+                continue
+            stamp = match.group(1)
+            ts = datetime.strptime(stamp, STAMP_FORMAT).timestamp()
+            person, expected = people.get(stamp, (None, None))
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            phash = dhash(image) if image is not None else 0
+            size = os.path.getsize(path)
+            rows.append((ts, ts, "legacy", person, expected, "UNAUTHORIZED", name, None, size,
+                         phash - 2**64 if phash >= 2**63 else phash))
+            self.total_bytes += size
+
+        self.db.executemany(
+            "INSERT INTO snapshots (ts, last_ts, camera, person, expected, status, path, thumb, bytes, phash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.db.commit()
+        return len(rows)
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+
+def _parse_time(value):
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and prune the alert snapshot store")
+    parser.add_argument("--root", default=ALERTS_DIR)
+    parser.add_argument("--person")
+    parser.add_argument("--camera")
+    parser.add_argument("--since", help="ISO time, e.g. 2026-02-20T12:00")
+    parser.add_argument("--until", help="ISO time")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--max-mb", type=float, default=500)
+    parser.add_argument("--max-age-days", type=float, default=30)
+    parser.add_argument("--adopt-legacy", action="store_true", help="Index old unmanaged alert JPEGs")
+    parser.add_argument("--prune", action="store_true", help="Apply the retention limits now")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.root, max_mb=args.max_mb, max_age_days=args.max_age_days)
+    if args.adopt_legacy:
+        print(f"📥 Indexed {store.adopt_legacy()} legacy snapshots")
+    if args.prune:
+        print(f"🧹 Removed {store.enforce_retention()} snapshots")
+
+    for row in store.query(_parse_time(args.since), _parse_time(args.until), args.person, args.camera, args.limit):
+        when = datetime.fromtimestamp(row["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"{when}  {row['camera']:<8} {row['person'] or '?':<14} expected {row['expected'] or '?':<10} "
+              f"x{row['repeats'] + 1:<3} {row['path']}")
+    print(f"📊 {store.stats()}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import os
+import sys
+
+from edge_runtime.runtime import EdgeRuntime
+from edge_runtime.telemetry import Telemetry
+from edge_runtime.uplink import FrameUploader, AlertClient
+
+# One camera, several detectors, one process: every plugin shares the same
+# capture, the same RGB/resized conversions and the same upload.
+#
+#   python edge_node.py --plugins pose,objects,face --upload-url http://127.0.0.1:8000/upload_frame
+#   python edge_node.py --infer-on-server 1      # thin node: camera only, detectors run on the server
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DRAWER_DIR = os.path.join(ROOT, "money_drawer_detection")
+CASHIER_DIR = os.path.join(ROOT, "cashier_monitoring")
+sys.path.extend([DRAWER_DIR, CASHIER_DIR])
+
+SERVER = "http://64.227.160.247:8000"
+PLUGINS = ["pose", "objects", "drawer", "face"]
+
+
+def build_plugins(names, server):
+    """Imports only the detectors that were asked for, so a node doesn't need every model installed."""
+    alerts = AlertClient(f"{server}/alerts", cooldown_seconds=10)
+    plugins = []
+    for name in names:
+        if name == "pose":
+            from pos_plugins import PosePlugin
+            plugins.append(PosePlugin(alerts))
+        elif name == "objects":
+            from pos_plugins import ObjectPlugin
+            plugins.append(ObjectPlugin(alerts))
+        elif name == "drawer":
+            from drawer_plugin import DrawerPlugin
+            plugins.append(DrawerPlugin(AlertClient(f"{server}/alerts", cooldown_seconds=0)))
+        elif name == "face":
+            from face_module.encoder import build_face_database
+            from face_module.recognizer import FaceRecognizer
+            from face_module.plugin import FacePlugin
+            from utils.snapshot_store import SnapshotStore
+            database = build_face_database(os.path.join(CASHIER_DIR, "dataset"))
+            plugins.append(FacePlugin(FaceRecognizer(database), f"{server}/set_cashier_status",
+                                      SnapshotStore(camera="cashier")))
+    return plugins
+
+
+def build_transform(names):
+    if "drawer" in names:
+        # The drawer's trigger line is calibrated on resize_to_standard() frames
+        from drawer_logic import resize_to_standard
+        return resize_to_standard
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several detectors on one camera")
+    parser.add_argument("--source", default="0", help="Camera index or video file")
+    parser.add_argument("--plugins", default="pose,objects", help=f"Comma-separated, from: {','.join(PLUGINS)}")
+    parser.add_argument("--server", default=SERVER)
+    parser.add_argument("--upload-url", help="Frame upload endpoint (default: <server>/upload_frame)")
+    parser.add_argument("--flip", action="store_true", help="Mirror the camera")
+    parser.add_argument("--no-window", action="store_true")
+    parser.add_argument("--node-name", default="edge-node", help="Name shown in the dashboard's GET /telemetry")
+    parser.add_argument("--infer-on-server", type=int, metavar="CAMERA",
+                        help="Run no detectors here; the server's inference pool runs them as this camera (1-3)")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.plugins.split(",") if name.strip()]
+    unknown = set(names) - set(PLUGINS)
+    if unknown:
+        parser.error(f"unknown plugins: {', '.join(sorted(unknown))}")
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    uploader = FrameUploader(args.upload_url or f"{args.server}/upload_frame")
+    if args.infer_on_server:
+        # Thin node: raw frames at a quality the detectors can work with; the server paces us
+        names = []
+        uploader = FrameUploader(f"{args.server}/infer_frame/{args.infer_on_server}", quality=80, timeout=1.0)
+
+    print(f"Loading plugins: {', '.join(names) or 'none (server-side inference)'}")
+    runtime = EdgeRuntime(
+        source, build_plugins(names, args.server),
+        uploader=uploader,
+        window_name=None if args.no_window else "Edge AI Node",
+        flip=args.flip,
+        transform=build_transform(names),
+        loop=not isinstance(source, int),
+        telemetry=Telemetry(args.node_name, f"{args.server}/telemetry")
+    )
+    print(f"🚀 Edge AI Node Active!")
+    runtime.run()
+
+
+if __name__ == "__main__":
+    main()
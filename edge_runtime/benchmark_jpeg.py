@@ -0,0 +1,87 @@
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from edge_runtime.jpeg import PRESETS, JpegEncoder
+
+# Per-frame cost and size of each JPEG option on 640x480 frames, against the
+# imencode(quality=60) + tobytes() every edge node used to do.
+#
+#   python -m edge_runtime.benchmark_jpeg
+#   python -m edge_runtime.benchmark_jpeg --video money_drawer_detection/raw_theft_video.mp4
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+DEFAULT_VIDEO = os.path.join(ROOT, "money_drawer_detection", "raw_theft_video.mp4")
+
+
+def load_frames(video, count, size=(640, 480)):
+    """Evenly spaced frames from `video`, resized to `size`; synthetic frames if it can't be read."""
+    frames = []
+    cap = cv2.VideoCapture(video)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+    for idx in np.linspace(0, max(total - 1, 0), count).astype(int) if total else []:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(idx))
+        ret, frame = cap.read()
+        if ret:
+            frames.append(cv2.resize(frame, size, interpolation=cv2.INTER_AREA))
+    cap.release()
+
+    if not frames:
+        print(f"⚠️  Could not read {video}, using synthetic frames")
+        rng = np.random.default_rng(0)
+        gradient = np.linspace(0, 255, size[0], dtype=np.float32)[None, :, None]
+        for _ in range(count):
+            noise = rng.normal(0, 12, (size[1], size[0], 3))
+            frames.append(np.clip(gradient + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def bench(encode, frames, repeats):
+    """Best-of-N ms per frame and mean encoded KB."""
+    best = float("inf")
+    sizes = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        sizes = [len(encode(frame)) for frame in frames]
+        best = min(best, (time.perf_counter() - start) * 1000 / len(frames))
+    return best, float(np.mean(sizes)) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JPEG encoder micro-benchmark on 640x480 frames")
+    parser.add_argument("--video", default=DEFAULT_VIDEO)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    print(f"🎞️  {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    def legacy(frame):
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 60])
+        return buffer.tobytes()
+
+    rows = [("imencode q60 + tobytes", legacy)]
+    backends = ["opencv"]
+    if JpegEncoder().backend == "turbo":
+        backends.append("turbo")
+    else:
+        print("ℹ️  PyTurboJPEG/libjpeg-turbo not installed, skipping the turbo backend")
+
+    for backend in backends:
+        for name, (quality, subsampling) in PRESETS.items():
+            encoder = JpegEncoder(quality, subsampling, backend)
+            rows.append((f"{backend} {name} (q{quality}, {subsampling})", encoder.encode))
+
+    baseline = None
+    for name, encode in rows:
+        ms, kb = bench(encode, frames, args.repeats)
+        baseline = baseline or ms
+        print(f"{name:<30} {ms:6.2f} ms/frame | {kb:6.1f} KB | {baseline / ms:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
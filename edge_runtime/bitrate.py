@@ -0,0 +1,89 @@
+import numpy as np
+
+
+def _stage(level, low, high):
+    """0 below `low`, 1 above `high`, linear in between."""
+    return float(np.clip((level - low) / (high - low), 0.0, 1.0))
+
+
+class BitrateController:
+    """Adapts upload quality, resolution and send rate to how the link is doing.
+
+    A single `level` in [0, 1] drives all three knobs, degrading them in
+    stages: JPEG quality goes first (level 1.0 -> 0.5), then send rate
+    (0.7 -> 0.2), and resolution only last (0.4 -> 0.0), since a smaller
+    picture is the most visible loss. The level moves AIMD-style: every
+    failed or slow upload cuts it by `backoff`, every fast one adds `step`.
+    The POST timeout follows the measured latency instead of a fixed 0.5 s.
+    """
+
+    def __init__(self, min_quality=30, max_quality=60, min_width=320, max_width=640,
+                 min_fps=2.0, max_fps=30.0, target_latency=0.15, max_failure_rate=0.1,
+                 min_timeout=0.3, max_timeout=2.0, backoff=0.8, step=0.02, smoothing=0.2):
+        self.min_quality, self.max_quality = min_quality, max_quality
+        self.min_width, self.max_width = min_width, max_width
+        self.min_fps, self.max_fps = min_fps, max_fps
+        self.target_latency = target_latency
+        self.max_failure_rate = max_failure_rate
+        self.min_timeout, self.max_timeout = min_timeout, max_timeout
+        self.backoff = backoff
+        self.step = step
+        self.smoothing = smoothing
+
+        self.level = 1.0
+        self.latency = None       # Smoothed seconds per successful upload
+        self.failure_rate = 0.0   # Smoothed fraction of failed uploads
+        self.sent = 0
+        self.failed = 0
+
+    def record(self, latency, ok):
+        """Feeds back one upload: how long it took (seconds) and whether it succeeded."""
+        a = self.smoothing
+        self.failure_rate = (1 - a) * self.failure_rate + a * (0.0 if ok else 1.0)
+        if ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+        # A timed-out upload says the link is at least that slow, so it lets the timeout grow;
+        # a fast failure (connection refused) says nothing about latency
+        if ok or latency >= 0.9 * self.timeout:
+            self.latency = latency if self.latency is None else (1 - a) * self.latency + a * latency
+
+        if not ok or self.failure_rate > self.max_failure_rate or (self.latency or 0.0) > 2 * self.target_latency:
+            self.level = max(0.0, self.level * self.backoff - 0.01)
+        elif self.latency < self.target_latency and self.failure_rate < self.max_failure_rate / 2:
+            self.level = min(1.0, self.level + self.step)
+        # Between target and 2x target: hold steady
+
+    @property
+    def quality(self):
+        return int(round(self.min_quality + (self.max_quality - self.min_quality) * _stage(self.level, 0.5, 1.0)))
+
+    @property
+    def fps(self):
+        return self.min_fps + (self.max_fps - self.min_fps) * _stage(self.level, 0.2, 0.7)
+
+    @property
+    def width(self):
+        width = self.min_width + (self.max_width - self.min_width) * _stage(self.level, 0.0, 0.4)
+        return int(width) // 16 * 16  # JPEG works in 16x16 blocks with 4:2:0
+
+    @property
+    def timeout(self):
+        if self.latency is None:
+            return min(max(0.5, self.min_timeout), self.max_timeout)
+        return float(np.clip(4 * self.latency, self.min_timeout, self.max_timeout))
+
+    def state(self):
+        """Current knobs and link measurements, for logs and the telemetry endpoint."""
+        return {
+            "level": round(self.level, 3),
+            "quality": self.quality,
+            "width": self.width,
+            "fps": round(self.fps, 1),
+            "timeout_s": round(self.timeout, 3),
+            "latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+            "failure_rate": round(self.failure_rate, 3),
+            "sent": self.sent,
+            "failed": self.failed,
+        }
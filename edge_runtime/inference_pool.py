@@ -0,0 +1,307 @@
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+import cv2
+import numpy as np
+
+from edge_runtime.jpeg import JpegEncoder
+from edge_runtime.runtime import EdgeRuntime
+from edge_runtime.telemetry import Telemetry
+
+# Server-side inference for thin camera nodes: the backend queues the JPEGs they
+# post, and worker processes run the same plugins an edge laptop would. Each
+# camera is pinned to one worker, because the plugins keep per-camera state
+# (trackers, pose history, alert cooldowns) that has to see every frame in order.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FairFrameQueue:
+    """The newest `per_camera` frames of every camera, handed out round-robin.
+
+    A camera posting faster than it is served only ever replaces its own
+    oldest frame, so it can't crowd out the others or grow the queue.
+    """
+
+    def __init__(self, per_camera=2):
+        self.per_camera = per_camera
+        self.frames = {}          # camera -> deque of items
+        self.turn = deque()       # Round-robin order of cameras
+        self.dropped = Counter()
+        self.lock = threading.Lock()
+
+    def put(self, camera, item):
+        """Queues `item`; returns False if that meant dropping this camera's oldest frame."""
+        with self.lock:
+            frames = self.frames.get(camera)
+            if frames is None:
+                frames = self.frames[camera] = deque()
+                self.turn.append(camera)
+            dropped = len(frames) >= self.per_camera
+            if dropped:
+                frames.popleft()
+                self.dropped[camera] += 1
+            frames.append(item)
+            return not dropped
+
+    def take(self, cameras, limit):
+        """Up to `limit` (camera, item) pairs from `cameras`, one camera at a time in turn."""
+        batch = []
+        with self.lock:
+            while len(batch) < limit:
+                served = False
+                for _ in range(len(self.turn)):
+                    camera = self.turn[0]
+                    self.turn.rotate(-1)
+                    if camera in cameras and self.frames[camera]:
+                        batch.append((camera, self.frames[camera].popleft()))
+                        served = True
+                        if len(batch) >= limit:
+                            break
+                if not served:
+                    break
+        return batch
+
+    def depth(self, camera=None):
+        with self.lock:
+            if camera is not None:
+                return len(self.frames.get(camera, ()))
+            return sum(len(frames) for frames in self.frames.values())
+
+
+class _FrameClock:
+    """Makes frame.time the moment the server received the frame, not when a worker got to it."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+def _worker_main(index, generation, inbox, outbox, camera_plugins, server, quality):
+    """Worker process: builds each camera's plugins on first use and runs every batch it is sent."""
+    sys.path.insert(0, ROOT)
+    from edge_node import build_plugins, build_transform
+
+    runtimes = {}
+    encoder = JpegEncoder(quality=quality)
+    while True:
+        batch = inbox.get()
+        if batch is None:
+            break
+
+        started = time.perf_counter()
+        results = []
+        for camera, (data, received) in batch:
+            try:
+                runtime = runtimes.get(camera)
+                if runtime is None:
+                    names = camera_plugins[camera]
+                    runtime = runtimes[camera] = EdgeRuntime(
+                        None, build_plugins(names, server), transform=build_transform(names),
+                        telemetry=Telemetry(f"inference-cam{camera}", f"{server}/telemetry"), clock=_FrameClock())
+                    print(f"🧠 Worker {index}: camera {camera} running {', '.join(names)}")
+
+                image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+                if image is None:
+                    continue
+                runtime.clock.now = received
+                # MediaPipe wants strictly increasing timestamps per stream
+                timestamp_ms = max(int(received * 1000), runtime.last_timestamp + 1)
+                runtime.last_timestamp = timestamp_ms
+
+                frame = runtime.next_frame(image, timestamp_ms)
+                runtime.telemetry.frame_done()
+                results.append((camera, bytes(encoder.encode(frame.canvas)),
+                                [text for text, _ in frame.alerts], received))
+            except Exception as e:
+                print(f"⚠️ Worker {index}: camera {camera} frame failed: {e}")
+        outbox.put((index, generation, len(batch), results, time.perf_counter() - started))
+
+    for runtime in runtimes.values():
+        for plugin in runtime.plugins:
+            plugin.close()
+
+
+class _Worker:
+    def __init__(self, index):
+        self.index = index
+        self.process = None
+        self.inbox = None
+        self.generation = 0  # Bumped on every (re)start; results from an earlier process don't count
+        self.restarts = 0
+        self.started_at = 0.0
+        self.cameras = set()
+        self.inflight = 0    # Batches sent and not yet answered; guarded by InferencePool.lock
+        self.seconds_per_frame = None  # Smoothed processing cost, for the fair-share rate
+
+
+class InferencePool:
+    """Runs edge plugins for posted frames on `workers` processes and reports the annotated results.
+
+    `camera_plugins` maps camera -> plugin names (see edge_node.PLUGINS).
+    `submit()` never blocks: each camera keeps only its newest frames, and
+    `hint()` gives the fps that camera's fair share of its worker can keep
+    up with, for the upload response. A worker is sent up to `batch_size`
+    frames at a time, at most `max_inflight` batches ahead. `on_result`
+    is called from a background thread with (camera, jpeg, alert lines,
+    received time) for every finished frame; alerts themselves go out
+    through each plugin's AlertClient, to `<server>/alerts` like any node.
+    """
+
+    # A worker that died (OOM, a native crash in a model) is restarted, but no more often than this
+    RESTART_BACKOFF_SECONDS = 5.0
+
+    def __init__(self, camera_plugins, server, workers=2, batch_size=4, max_inflight=2,
+                 per_camera=2, quality=60, on_result=None, min_fps=1.0, max_fps=15.0):
+        self.camera_plugins = camera_plugins
+        self.server = server
+        self.quality = quality
+        self.batch_size = batch_size
+        self.max_inflight = max_inflight
+        self.on_result = on_result
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.queue = FairFrameQueue(per_camera)
+        self.processed = Counter()
+        self.latency = {}  # camera -> smoothed seconds from receipt to result
+        self.wake = threading.Event()
+        self.lock = threading.Lock()  # Worker inflight counts and camera assignment
+        self.running = True
+
+        # Spawned, not forked: the server process already runs threads (uvicorn, this pool)
+        self.context = multiprocessing.get_context("spawn")
+        self.outbox = self.context.Queue()
+        self.workers = [_Worker(index) for index in range(workers)]
+        for worker in self.workers:
+            self._start(worker)
+        self.assignment = {}  # camera -> _Worker
+
+        self.dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self.collector = threading.Thread(target=self._collect, daemon=True)
+        self.dispatcher.start()
+        self.collector.start()
+
+    def _start(self, worker):
+        """(Re)starts `worker`'s process with a fresh inbox; batches sent to the old one are written off."""
+        with self.lock:
+            worker.generation += 1
+            worker.inflight = 0
+            worker.seconds_per_frame = None
+            worker.inbox = self.context.Queue()
+            worker.started_at = time.time()
+            worker.process = self.context.Process(
+                target=_worker_main, daemon=True, name=f"inference-{worker.index}",
+                args=(worker.index, worker.generation, worker.inbox, self.outbox,
+                      self.camera_plugins, self.server, self.quality))
+        worker.process.start()
+
+    def _restart_dead_workers(self):
+        for worker in self.workers:
+            if worker.process.is_alive() or not self.running:
+                continue
+            if time.time() - worker.started_at < self.RESTART_BACKOFF_SECONDS:
+                continue
+            print(f"⚠️ Inference worker {worker.index} died (exit code {worker.process.exitcode}); "
+                  f"restarting it for cameras {sorted(worker.cameras)}")
+            worker.restarts += 1
+            # Its cameras stay pinned to it: the new process rebuilds their plugins on the next frame
+            self._start(worker)
+
+    def _worker_for(self, camera):
+        with self.lock:
+            worker = self.assignment.get(camera)
+            if worker is None:
+                worker = min(self.workers, key=lambda w: len(w.cameras))
+                worker.cameras.add(camera)
+                self.assignment[camera] = worker
+            return worker
+
+    def submit(self, camera, data):
+        """Queues one JPEG from `camera`. Returns False if the camera is outrunning its worker."""
+        if camera not in self.camera_plugins:
+            raise KeyError(camera)
+        self._worker_for(camera)
+        accepted = self.queue.put(camera, (data, time.time()))
+        self.wake.set()
+        return accepted
+
+    def _dispatch(self):
+        while self.running:
+            self.wake.wait(0.1)
+            self.wake.clear()
+            self._restart_dead_workers()
+            for worker in self.workers:
+                while worker.process.is_alive():
+                    with self.lock:
+                        if worker.inflight >= self.max_inflight:
+                            break
+                        batch = self.queue.take(worker.cameras, self.batch_size)
+                        if not batch:
+                            break
+                        worker.inflight += 1
+                        inbox = worker.inbox
+                    inbox.put(batch)
+
+    def _collect(self):
+        while self.running:
+            try:
+                index, generation, sent, results, seconds = self.outbox.get(timeout=0.5)
+            except Exception:
+                continue
+            worker = self.workers[index]
+            with self.lock:
+                if generation == worker.generation:
+                    worker.inflight -= 1
+                    cost = seconds / max(sent, 1)
+                    worker.seconds_per_frame = cost if worker.seconds_per_frame is None else \
+                        0.8 * worker.seconds_per_frame + 0.2 * cost
+            self.wake.set()
+
+            now = time.time()
+            for camera, jpeg, alerts, received in results:
+                self.processed[camera] += 1
+                self.latency[camera] = 0.8 * self.latency.get(camera, now - received) + 0.2 * (now - received)
+                if self.on_result:
+                    try:
+                        self.on_result(camera, jpeg, alerts, received)
+                    except Exception as e:
+                        print(f"⚠️ Inference result handler failed: {e}")
+
+    def hint(self, camera):
+        """Upload rate for `camera`: its share of its worker's measured throughput."""
+        worker = self._worker_for(camera)
+        if not worker.seconds_per_frame:
+            fps = self.max_fps
+        else:
+            fps = 0.9 / (worker.seconds_per_frame * max(len(worker.cameras), 1))
+        return {"wanted_fps": round(min(max(fps, self.min_fps), self.max_fps), 1),
+                "wanted_quality": None, "queued": self.queue.depth(camera)}
+
+    def stats(self):
+        return {
+            "workers": [{"index": w.index, "alive": w.process.is_alive(), "restarts": w.restarts,
+                         "cameras": sorted(w.cameras), "inflight": w.inflight,
+                         "ms_per_frame": round(w.seconds_per_frame * 1000, 1) if w.seconds_per_frame else None}
+                        for w in self.workers],
+            "cameras": {str(camera): {"plugins": self.camera_plugins[camera],
+                                      "processed": self.processed[camera],
+                                      "dropped": self.queue.dropped[camera],
+                                      "latency_ms": round(self.latency[camera] * 1000, 1) if camera in self.latency else None,
+                                      **self.hint(camera)}
+                        for camera in sorted(self.assignment)},
+        }
+
+    def close(self, timeout=5.0):
+        self.running = False
+        for worker in self.workers:
+            worker.inbox.put(None)
+        for worker in self.workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
@@ -0,0 +1,105 @@
+import cv2
+
+# Named quality / chroma-subsampling combinations. "420" halves colour resolution in both
+# directions, which is nearly invisible on camera footage and makes the encode cheaper.
+PRESETS = {
+    "low": (40, "420"),       # Congested links, keepalive frames
+    "balanced": (60, "420"),  # What every edge node has always sent
+    "high": (85, "444"),      # Full chroma, e.g. when someone zooms in on a feed
+}
+
+SUBSAMPLING = ("444", "422", "420", "gray")
+
+_CV2_SAMPLING = {
+    "444": getattr(cv2, "IMWRITE_JPEG_SAMPLING_FACTOR_444", None),
+    "422": getattr(cv2, "IMWRITE_JPEG_SAMPLING_FACTOR_422", None),
+    "420": getattr(cv2, "IMWRITE_JPEG_SAMPLING_FACTOR_420", None),
+}
+
+
+def _load_turbojpeg():
+    """Returns (TurboJPEG instance, turbojpeg module), or None if PyTurboJPEG or libjpeg-turbo is missing."""
+    try:
+        import turbojpeg
+        return turbojpeg.TurboJPEG(), turbojpeg
+    except Exception:
+        return None
+
+
+class JpegEncoder:
+    """Encodes BGR frames to JPEG with as few copies as possible.
+
+    backend="turbo" uses libjpeg-turbo through PyTurboJPEG and compresses
+    straight into a preallocated buffer that is reused frame after frame;
+    backend="opencv" uses cv2.imencode. "auto" picks turbo when it is
+    installed. encode() returns a memoryview onto the encoder's own memory
+    (no tobytes() copy), which stays valid until the next encode() call.
+    """
+
+    def __init__(self, quality=60, subsampling="420", backend="auto"):
+        if subsampling not in SUBSAMPLING:
+            raise ValueError(f"subsampling must be one of {SUBSAMPLING}, got {subsampling!r}")
+        self.quality = quality
+        self.subsampling = subsampling
+
+        self._turbo = None
+        if backend in ("auto", "turbo"):
+            self._turbo = _load_turbojpeg()
+            if self._turbo is None and backend == "turbo":
+                raise ImportError("backend='turbo' needs PyTurboJPEG and libjpeg-turbo (pip install PyTurboJPEG)")
+        elif backend != "opencv":
+            raise ValueError(f"backend must be 'auto', 'turbo' or 'opencv', got {backend!r}")
+        self.backend = "turbo" if self._turbo else "opencv"
+
+        self._buffer = None  # Turbo: reused output buffer, grown when a frame needs more room
+        self._last = None    # OpenCV: keeps the last imencode() array alive behind the memoryview
+
+    @classmethod
+    def from_preset(cls, name, backend="auto"):
+        quality, subsampling = PRESETS[name]
+        return cls(quality, subsampling, backend)
+
+    def encode(self, image):
+        """JPEG bytes for a BGR (or single-channel) uint8 image, as a memoryview."""
+        if self._turbo:
+            return self._encode_turbo(image)
+        return self._encode_opencv(image)
+
+    def _encode_turbo(self, image):
+        jpeg, module = self._turbo
+        subsample = {
+            "444": module.TJSAMP_444, "422": module.TJSAMP_422,
+            "420": module.TJSAMP_420, "gray": module.TJSAMP_GRAY,
+        }[self.subsampling]
+        pixel_format = module.TJPF_GRAY if image.ndim == 2 else module.TJPF_BGR
+        if image.ndim == 2:
+            subsample = module.TJSAMP_GRAY
+
+        if not hasattr(jpeg, "buffer_size"):
+            # Old PyTurboJPEG without dst=: still faster than imencode, just one allocation per frame
+            return memoryview(jpeg.encode(image, quality=self.quality, pixel_format=pixel_format,
+                                          jpeg_subsample=subsample))
+
+        # buffer_size() is libjpeg-turbo's worst case, so compression can never overflow it
+        needed = jpeg.buffer_size(image, subsample)
+        if self._buffer is None or len(self._buffer) < needed:
+            self._buffer = bytearray(needed)
+
+        _, size = jpeg.encode(image, quality=self.quality, pixel_format=pixel_format,
+                              jpeg_subsample=subsample, dst=self._buffer)
+        return memoryview(self._buffer)[:size]
+
+    def _encode_opencv(self, image):
+        if self.subsampling == "gray" and image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        sampling = _CV2_SAMPLING.get(self.subsampling)
+        if sampling is not None:
+            params += [cv2.IMWRITE_JPEG_SAMPLING_FACTOR, sampling]
+
+        ok, buffer = cv2.imencode('.jpg', image, params)
+        if not ok:
+            raise ValueError("cv2.imencode failed")
+        self._last = buffer
+        return memoryview(buffer).cast("B")
@@ -0,0 +1,85 @@
+import time
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Cheap scene-change detector used to decide how hard the models should work.
+
+    The frame is shrunk to a tiny grayscale thumbnail and compared against a
+    slowly-updated background, so a call costs a fraction of a millisecond.
+    """
+
+    def __init__(self, size=(80, 60), pixel_threshold=18, area_threshold=0.004,
+                 background_rate=0.05, hold_seconds=3.0):
+        self.size = size
+        self.pixel_threshold = pixel_threshold   # Grey-level change that counts as "moved"
+        self.area_threshold = area_threshold     # Fraction of moved pixels that counts as motion
+        self.background_rate = background_rate   # How fast the background absorbs slow changes
+        self.hold_seconds = hold_seconds         # Stay "active" this long after the last motion
+        self.background = None
+        self.last_motion_time = 0.0
+        self.score = 0.0
+
+    def update(self, frame, now=None):
+        """Feeds a BGR frame and returns True while the scene is considered active."""
+        now = time.time() if now is None else now
+
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0).astype(np.float32)
+
+        if self.background is None:
+            self.background = small
+            self.last_motion_time = now
+            self.score = 1.0
+            return True
+
+        changed = np.abs(small - self.background) > self.pixel_threshold
+        self.score = float(changed.mean())
+        cv2.accumulateWeighted(small, self.background, self.background_rate)
+
+        if self.score > self.area_threshold:
+            self.last_motion_time = now
+
+        return self.is_active(now)
+
+    def is_active(self, now=None):
+        now = time.time() if now is None else now
+        return now - self.last_motion_time < self.hold_seconds
+
+
+class AdaptiveCadence:
+    """Decides, frame by frame, whether one model should run.
+
+    While the scene is active the model runs every `active_every` frames; when
+    it is idle it drops to every `idle_every` frames. Regardless of the scene it
+    always runs at least once every `floor_seconds`, so a completely still
+    camera is never left unchecked.
+    """
+
+    def __init__(self, active_every=1, idle_every=15, floor_seconds=2.0):
+        self.active_every = max(1, active_every)
+        self.idle_every = max(1, idle_every)
+        self.floor_seconds = floor_seconds
+        self.frames_since_run = None
+        self.last_run_time = 0.0
+
+    def should_run(self, scene_active, now=None):
+        now = time.time() if now is None else now
+        every = self.active_every if scene_active else self.idle_every
+
+        due = (
+            self.frames_since_run is None
+            or self.frames_since_run + 1 >= every
+            or now - self.last_run_time >= self.floor_seconds
+        )
+
+        if due:
+            self.frames_since_run = 0
+            self.last_run_time = now
+        else:
+            self.frames_since_run += 1
+        return due
@@ -0,0 +1,163 @@
+import glob
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from edge_runtime.jpeg import JpegEncoder
+from edge_runtime.runtime import EdgeRuntime
+from edge_runtime.telemetry import Telemetry, NULL_TIMER
+from edge_runtime.uplink import AlertClient
+
+# Deterministic replays of recorded footage through edge plugins, for comparing
+# versions: same frames, same clock, no network, so only speed may change.
+
+# Monday 10:00 local time: inside the morning shift in config/shifts.json
+DEFAULT_START = datetime(2024, 1, 1, 10, 0).timestamp()
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+class ReplayClock:
+    """Frame clock: frame i happens at start + i / fps, however long processing takes."""
+
+    def __init__(self, fps=30.0, start=DEFAULT_START):
+        self.fps = fps
+        self.start = start
+        self.now = start
+
+    def set_frame(self, index):
+        self.now = self.start + index / self.fps
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingAlerts(AlertClient):
+    """AlertClient that records what would have been posted instead of posting it."""
+
+    def __init__(self, clock, cooldown_seconds=10):
+        super().__init__(url=None, cooldown_seconds=cooldown_seconds, verbose=False)
+        self.clock = clock
+        self.sent = []
+
+    def post(self, payload):
+        self.sent.append({"t": round(self.clock() - self.clock.start, 3), **payload})
+
+
+class StubUploader:
+    """Encodes like FrameUploader (so encode cost stays in the numbers) but never touches the network."""
+
+    def __init__(self, encode=True, quality=60):
+        self.encoder = JpegEncoder(quality=quality) if encode else None
+        self.telemetry = None
+        self.sent = 0
+        self.bytes = 0
+
+    def send(self, image):
+        if self.encoder:
+            with self.telemetry.stage("encode") if self.telemetry else NULL_TIMER:
+                self.bytes += len(self.encoder.encode(image))
+        self.sent += 1
+        return True
+
+    def state(self):
+        return {"sent": self.sent, "bytes": self.bytes}
+
+
+def iter_frames(source, max_frames=None):
+    """BGR frames from a video file, or from every image under a directory (sorted by path)."""
+    count = 0
+    if os.path.isdir(source):
+        paths = sorted(p for p in glob.glob(os.path.join(source, "**", "*"), recursive=True)
+                       if p.lower().endswith(IMAGE_EXTENSIONS))
+        for path in paths:
+            if max_frames is not None and count >= max_frames:
+                return
+            image = cv2.imread(path)
+            if image is not None:
+                count += 1
+                yield image
+        return
+
+    cap = cv2.VideoCapture(source)
+    try:
+        while max_frames is None or count < max_frames:
+            ret, image = cap.read()
+            if not ret:
+                break
+            count += 1
+            yield image
+    finally:
+        cap.release()
+
+
+def _digest(data):
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def replay(plugins, frames, clock, alerts=None, transform=None, encode=True):
+    """Runs `frames` through `plugins` on `clock` and returns timings plus every detection output.
+
+    Outputs are the alerts that would have been posted, the overlay alert
+    lines whenever they change, and status changes of plugins that keep a
+    `current_status` (the face node). `detections_digest` hashes all three,
+    so two runs agree on detections iff their digests match.
+    """
+    telemetry = Telemetry(node="replay", url=None, window=100000)
+    uploader = StubUploader(encode=encode)
+    runtime = EdgeRuntime(None, plugins, uploader=uploader, transform=transform, telemetry=telemetry, clock=clock)
+
+    latencies = []
+    overlay, last_overlay = [], None
+    statuses, last_statuses = [], {}
+    started = time.perf_counter()
+    try:
+        for index, image in enumerate(frames):
+            clock.set_frame(index)
+            # MediaPipe wants strictly increasing timestamps; frame 0 at 1 ms
+            timestamp_ms = int(round(index * 1000 / clock.fps)) + 1
+
+            frame_start = time.perf_counter()
+            frame = runtime.process_frame(image, timestamp_ms)
+            latencies.append(time.perf_counter() - frame_start)
+            telemetry.frames += 1
+
+            lines = [text for text, _ in frame.alerts]
+            if lines != last_overlay:
+                overlay.append({"frame": index, "alerts": lines})
+                last_overlay = lines
+
+            for plugin in plugins:
+                status = getattr(plugin, "current_status", None)
+                if status is not None and status != last_statuses.get(plugin.name):
+                    statuses.append({"frame": index, "plugin": plugin.name, "status": status})
+                    last_statuses[plugin.name] = status
+    finally:
+        for plugin in plugins:
+            plugin.close()
+    wall = time.perf_counter() - started
+
+    latencies_ms = np.asarray(latencies) * 1000
+    sent = alerts.sent if alerts else []
+    report = telemetry.report()
+    result = {
+        "frames": len(latencies),
+        "wall_s": round(wall, 3),
+        "fps": round(len(latencies) / max(wall, 1e-9), 2),
+        "latency_ms": {
+            name: round(float(value), 3) for name, value in zip(
+                ("p50", "p90", "p99", "max"),
+                np.percentile(latencies_ms, [50, 90, 99, 100]) if len(latencies_ms) else [0, 0, 0, 0])
+        },
+        "stages": {name: {k: v for k, v in stats.items() if k != "histogram"}
+                   for name, stats in report["stages"].items()},
+        "alerts_sent": sent,
+        "overlay_changes": overlay,
+        "status_changes": statuses,
+    }
+    result["detections_digest"] = _digest([sent, overlay, statuses])
+    return result
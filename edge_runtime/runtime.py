@@ -0,0 +1,236 @@
+import time
+
+import cv2
+
+from edge_runtime.motion import MotionGate, AdaptiveCadence
+from edge_runtime.telemetry import NULL_TIMER
+
+
+class Frame:
+    """One captured frame, shared by every plugin.
+
+    `image` is the clean camera frame and must not be drawn on; plugins draw on
+    `canvas` instead. Derived variants (RGB, grayscale, resized, MediaPipe
+    image) are computed on first use and cached, so three plugins asking for
+    RGB cost one cvtColor.
+    """
+
+    def __init__(self, image, index, timestamp_ms, now=None, scene_active=True):
+        self.image = image
+        self.index = index
+        self.timestamp_ms = timestamp_ms  # Strictly increasing, as MediaPipe VIDEO mode requires
+        self.time = time.time() if now is None else now  # Clock for cadences/cooldowns; fixed in replays
+        self.scene_active = scene_active
+        self.alerts = []                  # (text, color) lines for the overlay panel
+        self._canvas = None
+        self._cache = {}
+
+    @property
+    def shape(self):
+        return self.image.shape
+
+    @property
+    def canvas(self):
+        if self._canvas is None:
+            self._canvas = self.image.copy()
+        return self._canvas
+
+    def variant(self, key, compute):
+        """Returns the cached value for `key`, computing it with `compute()` the first time."""
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def rgb(self):
+        return self.variant("rgb", lambda: cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB))
+
+    @property
+    def gray(self):
+        return self.variant("gray", lambda: cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY))
+
+    def resized(self, width, height):
+        return self.variant(("resized", width, height),
+                            lambda: cv2.resize(self.image, (width, height), interpolation=cv2.INTER_AREA))
+
+    @property
+    def mp_image(self):
+        def compute():
+            import mediapipe as mp
+            return mp.Image(image_format=mp.ImageFormat.SRGB, data=self.rgb)
+        return self.variant("mp_image", compute)
+
+
+class Plugin:
+    """Base class for a detector running inside EdgeRuntime.
+
+    A plugin declares its cadence with `active_every` / `idle_every` /
+    `floor_seconds` (see AdaptiveCadence). Each frame the runtime calls
+    `step()`, which by default calls `process()` when the model is due and
+    `skip()` otherwise, then `render()` to apply per-frame logic and draw.
+    Plugins with more than one model can override `step()` directly, and
+    wrap each model call in `with self.timed("name"):` for telemetry.
+    """
+
+    name = "plugin"
+    active_every = 1
+    idle_every = 10
+    floor_seconds = 1.0
+
+    def __init__(self):
+        self.cadence = AdaptiveCadence(self.active_every, self.idle_every, self.floor_seconds)
+        self.telemetry = None  # Set by EdgeRuntime
+
+    def timed(self, stage):
+        """Context manager recording `<plugin name>.<stage>` latency, or a no-op without telemetry."""
+        return self.telemetry.stage(f"{self.name}.{stage}") if self.telemetry else NULL_TIMER
+
+    def is_active(self, frame):
+        return frame.scene_active
+
+    def step(self, frame):
+        if self.cadence.should_run(self.is_active(frame), now=frame.time):
+            with self.timed("model"):
+                self.process(frame)
+        else:
+            self.skip(frame)
+        with self.timed("annotate"):
+            self.render(frame)
+
+    def process(self, frame):
+        """Runs the model on `frame`."""
+
+    def skip(self, frame):
+        """Called instead of process() on frames where the model is not due."""
+
+    def render(self, frame):
+        """Per-frame logic on the latest results, drawing onto frame.canvas."""
+
+    def on_key(self, key):
+        pass
+
+    def close(self):
+        pass
+
+
+class EdgeRuntime:
+    """One capture loop feeding several detector plugins.
+
+    Handles capture, mirroring/resizing, motion gating, the alert overlay panel,
+    uploading the annotated frame and the local preview window, which every
+    node used to duplicate. With a Telemetry, every one of those stages
+    (and each plugin's model/annotate) is timed and reported.
+    """
+
+    def __init__(self, source, plugins, uploader=None, window_name=None, size=(640, 480),
+                 flip=False, transform=None, loop=False, wait_ms=1, motion_gate=None, telemetry=None,
+                 clock=time.time):
+        self.source = source
+        self.plugins = plugins
+        self.uploader = uploader
+        self.window_name = window_name
+        self.size = size
+        self.flip = flip
+        self.transform = transform  # e.g. resize_to_standard, applied before any plugin sees the frame
+        self.loop = loop          # Rewind video files at the end instead of stopping
+        self.wait_ms = wait_ms
+        self.motion_gate = motion_gate or MotionGate()
+        self.telemetry = telemetry
+        self.clock = clock  # Everything time-based reads frame.time, so a replay can substitute a fixed clock
+        if telemetry:
+            for plugin in plugins:
+                plugin.telemetry = telemetry
+            if uploader:
+                uploader.telemetry = telemetry
+                telemetry.extra["uploader"] = uploader.state
+        self.frame_index = 0
+        self.last_timestamp = 0
+
+    def open(self):
+        cap = cv2.VideoCapture(self.source)
+        if self.size and isinstance(self.source, int):
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.size[0])
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.size[1])
+        return cap
+
+    def _timestamp(self, cap):
+        if isinstance(self.source, int):
+            timestamp = int(self.clock() * 1000)
+        else:
+            timestamp = int(cap.get(cv2.CAP_PROP_POS_MSEC))
+        # MediaPipe requires strictly increasing timestamps (also across video loops)
+        if timestamp <= self.last_timestamp:
+            timestamp = self.last_timestamp + 1
+        self.last_timestamp = timestamp
+        return timestamp
+
+    def timed(self, stage):
+        return self.telemetry.stage(stage) if self.telemetry else NULL_TIMER
+
+    def next_frame(self, image, timestamp_ms):
+        """Runs every plugin on one image and returns the finished Frame."""
+        with self.timed("preprocess"):
+            if self.flip:
+                image = cv2.flip(image, 1)
+            if self.transform:
+                image = self.transform(image)
+            self.frame_index += 1
+
+            frame = Frame(image, self.frame_index, timestamp_ms, now=self.clock())
+            frame.scene_active = self.motion_gate.update(image, now=frame.time)
+
+        for plugin in self.plugins:
+            plugin.step(frame)
+
+        if frame.alerts:
+            canvas = frame.canvas
+            cv2.rectangle(canvas, (0, 0), (canvas.shape[1], 10 + (len(frame.alerts) * 35)), (0, 0, 0), -1)
+            for i, (text, color) in enumerate(frame.alerts):
+                cv2.putText(canvas, text, (15, 35 + (i * 35)), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+
+        return frame
+
+    def process_frame(self, image, timestamp_ms):
+        """next_frame() plus the upload; returns the finished Frame."""
+        frame = self.next_frame(image, timestamp_ms)
+        if self.uploader:
+            self.uploader.send(frame.canvas)
+        return frame
+
+    def run(self):
+        cap = self.open()
+        if not cap.isOpened():
+            print(f"❌ Error: Could not open {self.source}.")
+            return
+        try:
+            while cap.isOpened():
+                with self.timed("capture"):
+                    ret, image = cap.read()
+                if not ret:
+                    if self.loop:
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        continue
+                    print("Camera disconnected!")
+                    break
+
+                frame = self.process_frame(image, self._timestamp(cap))
+
+                if self.window_name:
+                    with self.timed("display"):
+                        cv2.imshow(self.window_name, frame.canvas)
+                        key = cv2.waitKey(self.wait_ms) & 0xFF
+                    if key == ord('q'):
+                        break
+                    for plugin in self.plugins:
+                        plugin.on_key(key)
+
+                if self.telemetry:
+                    self.telemetry.frame_done()
+        except KeyboardInterrupt:
+            print("\n⏹️  Stopping...")
+        finally:
+            for plugin in self.plugins:
+                plugin.close()
+            cap.release()
+            if self.window_name:
+                cv2.destroyAllWindows()
@@ -0,0 +1,183 @@
+import contextlib
+import os
+import socket
+import threading
+import time
+
+import numpy as np
+import requests
+
+try:
+    import psutil
+except ImportError:  # Optional: falls back to resource/getloadavg below
+    psutil = None
+
+# Histogram bucket edges in milliseconds, log-spaced from 0.1 ms to 10 s
+BUCKET_EDGES_MS = np.array([0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000])
+
+
+class StageStats:
+    """Rolling window of the last `window` durations of one stage."""
+
+    def __init__(self, window=512):
+        self.samples = np.zeros(window, dtype=np.float32)  # milliseconds
+        self.count = 0  # Total ever recorded; the window holds the last min(count, window)
+        self.interval_ms = 0.0  # Time spent in this stage since the last report
+
+    def record(self, seconds):
+        self.samples[self.count % len(self.samples)] = seconds * 1000.0
+        self.count += 1
+        self.interval_ms += seconds * 1000.0
+
+    def summary(self, frames):
+        """Window statistics, plus this stage's cost per frame over the `frames` since the last report."""
+        samples = self.samples[:min(self.count, len(self.samples))]
+        per_frame = self.interval_ms / max(frames, 1)
+        self.interval_ms = 0.0
+        if len(samples) == 0:
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        counts = np.bincount(np.searchsorted(BUCKET_EDGES_MS, samples), minlength=len(BUCKET_EDGES_MS) + 1)
+        return {
+            "count": self.count,
+            "ms_per_frame": round(per_frame, 3),  # Stages that don't run every frame cost less than their mean
+            "mean_ms": round(float(samples.mean()), 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(samples.max()), 3),
+            "histogram": counts.tolist(),  # counts[i]: edges[i-1] < ms <= edges[i]; last bucket is > 10 s
+        }
+
+
+class _Timer:
+    __slots__ = ("stats", "start")
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.record(time.perf_counter() - self.start)
+        return False
+
+
+NULL_TIMER = contextlib.nullcontext()
+
+
+class SystemSampler:
+    """Process CPU% (of one core) and memory, via psutil if installed."""
+
+    def __init__(self):
+        self.process = psutil.Process() if psutil else None
+        if self.process:
+            self.process.cpu_percent()  # First call only sets the baseline
+        self.last_wall = time.time()
+        self.last_cpu = self._cpu_seconds()
+
+    @staticmethod
+    def _cpu_seconds():
+        times = os.times()
+        return times.user + times.system
+
+    def sample(self):
+        now, cpu = time.time(), self._cpu_seconds()
+        if self.process:
+            cpu_percent = self.process.cpu_percent()
+            rss_mb = self.process.memory_info().rss / 2**20
+        else:
+            cpu_percent = 100.0 * (cpu - self.last_cpu) / max(now - self.last_wall, 1e-6)
+            rss_mb = None
+            try:
+                with open("/proc/self/statm") as f:  # Linux: resident pages are the second field
+                    rss_mb = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+            except (OSError, ValueError, AttributeError):
+                pass
+        self.last_wall, self.last_cpu = now, cpu
+
+        sample = {"cpu_percent": round(cpu_percent, 1), "rss_mb": None if rss_mb is None else round(rss_mb, 1)}
+        if psutil:
+            sample["system_cpu_percent"] = psutil.cpu_percent()
+            sample["system_memory_percent"] = psutil.virtual_memory().percent
+        if hasattr(os, "getloadavg"):
+            sample["load_avg"] = [round(x, 2) for x in os.getloadavg()]
+        return sample
+
+
+class Telemetry:
+    """Per-stage latency for an edge node, pushed to the dashboard's /telemetry every `interval` s.
+
+    Wrap a stage with `with telemetry.stage("capture"):`; recording is one
+    perf_counter pair and an array write. The push runs on a background
+    thread so a slow backend never stalls the video loop.
+    """
+
+    def __init__(self, node=None, url=None, interval=10.0, window=512):
+        self.node = node or socket.gethostname()
+        self.url = url
+        self.interval = interval
+        self.window = window
+        self.stages = {}
+        self.system = SystemSampler()
+        self.extra = {}               # Name -> callable returning a dict, e.g. the uploader's state()
+        self.frames = 0
+        self.started = time.time()
+        self.last_push = time.time()
+        self.last_push_frames = 0
+        self._pushing = False
+
+    def stage(self, name):
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(self.window)
+        return _Timer(stats)
+
+    def record(self, name, seconds):
+        self.stage(name).stats.record(seconds)
+
+    def frame_done(self):
+        """Counts a finished frame and pushes a report when one is due."""
+        self.frames += 1
+        now = time.time()
+        if self.url and now - self.last_push >= self.interval and not self._pushing:
+            report = self.report(now)
+            self._pushing = True
+            threading.Thread(target=self._push, args=(report,), daemon=True).start()
+
+    def report(self, now=None):
+        now = time.time() if now is None else now
+        frames = self.frames - self.last_push_frames
+        fps = frames / max(now - self.last_push, 1e-6)
+        self.last_push, self.last_push_frames = now, self.frames
+
+        stages = {name: stats.summary(frames) for name, stats in self.stages.items()}
+        # The stage eating the most time per frame is the one limiting fps (waits like capture included)
+        timed = {name: s["ms_per_frame"] for name, s in stages.items() if s.get("count")}
+        report = {
+            "node": self.node,
+            "timestamp": now,
+            "uptime_s": round(now - self.started, 1),
+            "frames": self.frames,
+            "fps": round(fps, 2),
+            "bottleneck": max(timed, key=timed.get) if timed else None,
+            "bucket_edges_ms": BUCKET_EDGES_MS.tolist(),
+            "stages": stages,
+            "system": self.system.sample(),
+        }
+        for name, state in self.extra.items():
+            try:
+                report[name] = state()
+            except Exception:
+                pass
+        return report
+
+    def _push(self, report):
+        try:
+            requests.post(self.url, json=report, timeout=2)
+        except Exception:
+            pass
+        finally:
+            self._pushing = False
@@ -0,0 +1,190 @@
+import numpy as np
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """Pairwise IoU between two (N, 4) and (M, 4) arrays of x1, y1, x2, y2 boxes."""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)), dtype=np.float32)
+
+    a = boxes_a[:, None, :]
+    b = boxes_b[None, :, :]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-6)
+
+
+def _greedy_match(iou, threshold):
+    """Matches rows to columns by descending IoU. Returns (pairs, unmatched_rows, unmatched_cols)."""
+    pairs = []
+    used_rows, used_cols = set(), set()
+
+    if iou.size:
+        order = np.dstack(np.unravel_index(np.argsort(-iou, axis=None), iou.shape))[0]
+        for r, c in order:
+            if iou[r, c] < threshold:
+                break
+            if r in used_rows or c in used_cols:
+                continue
+            pairs.append((int(r), int(c)))
+            used_rows.add(r)
+            used_cols.add(c)
+
+    unmatched_rows = [r for r in range(iou.shape[0]) if r not in used_rows]
+    unmatched_cols = [c for c in range(iou.shape[1]) if c not in used_cols]
+    return pairs, unmatched_rows, unmatched_cols
+
+
+class Track:
+    """One tracked box with a constant-velocity Kalman filter over (cx, cy, w, h)."""
+
+    # State transition (one step == one frame) and measurement matrices
+    F = np.eye(8, dtype=np.float32)
+    F[:4, 4:] = np.eye(4, dtype=np.float32)
+    H = np.eye(4, 8, dtype=np.float32)
+
+    def __init__(self, track_id, box, score, label):
+        x1, y1, x2, y2 = box
+        w, h = x2 - x1, y2 - y1
+        self.track_id = track_id
+        self.label = label
+        self.score = float(score)
+        self.hits = 1
+        self.misses = 0
+        self.age = 0
+        self.detection = None  # Index of the detection this track matched on the latest update()
+
+        self.x = np.array([x1 + w / 2, y1 + h / 2, w, h, 0, 0, 0, 0], dtype=np.float32)
+        std = np.array([w, h, w, h, w, h, w, h], dtype=np.float32) * np.array(
+            [0.1, 0.1, 0.1, 0.1, 0.2, 0.2, 0.2, 0.2], dtype=np.float32)
+        self.P = np.diag(np.square(std) + 1.0)
+
+    @property
+    def matched(self):
+        """True if a detection confirmed this track on the latest update()."""
+        return self.detection is not None
+
+    @property
+    def box(self):
+        cx, cy, w, h = self.x[:4]
+        return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], dtype=np.float32)
+
+    def _noise(self, pos_weight, vel_weight):
+        w, h = max(float(self.x[2]), 1.0), max(float(self.x[3]), 1.0)
+        return np.array([w, h, w, h], dtype=np.float32) * pos_weight, \
+            np.array([w, h, w, h], dtype=np.float32) * vel_weight
+
+    def predict(self):
+        pos_std, vel_std = self._noise(0.05, 0.00625)
+        Q = np.diag(np.square(np.concatenate([pos_std, vel_std])))
+        self.x = self.F @ self.x
+        self.x[2:4] = np.maximum(self.x[2:4], 1.0)
+        self.P = self.F @ self.P @ self.F.T + Q
+        self.age += 1
+        self.detection = None
+
+    def correct(self, box, score):
+        x1, y1, x2, y2 = box
+        z = np.array([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1], dtype=np.float32)
+        pos_std, _ = self._noise(0.05, 0)
+        R = np.diag(np.square(pos_std))
+
+        S = self.H @ self.P @ self.H.T + R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ (z - self.H @ self.x)
+        self.P = (np.eye(8, dtype=np.float32) - K @ self.H) @ self.P
+
+        self.score = float(score)
+        self.hits += 1
+        self.misses = 0
+
+
+class BoxTracker:
+    """IoU tracker with Kalman prediction, in the spirit of SORT/ByteTrack.
+
+    Call `update()` on frames where the detector ran and `predict()` on the
+    frames in between; both return the live tracks with their predicted boxes,
+    so the overlay keeps moving even when the detector is throttled. A track
+    the detector misses keeps coasting on its prediction for up to
+    `max_misses` detector runs before it is dropped.
+
+    Detections scoring at least `high_score` can start new tracks. Weaker ones
+    are only used in a second pass to keep existing tracks alive, which stops
+    IDs from flickering when a person is briefly half-occluded.
+    """
+
+    def __init__(self, iou_threshold=0.3, high_score=0.5, max_misses=3, min_hits=1):
+        self.iou_threshold = iou_threshold
+        self.high_score = high_score
+        self.max_misses = max_misses   # Detector runs a track may go unmatched before it is dropped
+        self.min_hits = min_hits
+        self.tracks = []
+        self.next_id = 1
+
+    def predict(self):
+        for track in self.tracks:
+            track.predict()
+        return self.active_tracks()
+
+    def update(self, boxes, scores, labels):
+        """Advances one frame and associates this frame's detections (x1, y1, x2, y2 boxes)."""
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+        labels = np.asarray(labels).reshape(-1)
+
+        for track in self.tracks:
+            track.predict()
+
+        high = np.flatnonzero(scores >= self.high_score)
+        low = np.flatnonzero(scores < self.high_score)
+
+        # Pass 1: confident detections against every track
+        unmatched_tracks, matched_high = self._associate(
+            list(range(len(self.tracks))), high, boxes, scores, labels)
+
+        # Pass 2: weak detections can only rescue tracks left over from pass 1
+        unmatched_tracks, _ = self._associate(unmatched_tracks, low, boxes, scores, labels)
+
+        for t in unmatched_tracks:
+            self.tracks[t].misses += 1
+
+        for d in high:
+            if int(d) not in matched_high:
+                track = Track(self.next_id, boxes[d], scores[d], labels[d])
+                track.detection = int(d)
+                self.tracks.append(track)
+                self.next_id += 1
+
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+        return self.active_tracks()
+
+    def _associate(self, track_indices, det_indices, boxes, scores, labels):
+        """Corrects matched tracks. Returns (unmatched track indices, matched detection indices)."""
+        matched = set()
+        if not track_indices or len(det_indices) == 0:
+            return track_indices, matched
+
+        track_boxes = np.stack([self.tracks[t].box for t in track_indices])
+        iou = iou_matrix(track_boxes, boxes[det_indices])
+
+        # Never let a track change class
+        track_labels = np.array([self.tracks[t].label for t in track_indices])
+        iou[track_labels[:, None] != labels[det_indices][None, :]] = 0
+
+        pairs, unmatched_rows, _ = _greedy_match(iou, self.iou_threshold)
+        for r, c in pairs:
+            d = det_indices[c]
+            self.tracks[track_indices[r]].correct(boxes[d], scores[d])
+            self.tracks[track_indices[r]].detection = int(d)
+            matched.add(int(d))
+
+        return [track_indices[r] for r in unmatched_rows], matched
+
+    def active_tracks(self):
+        """Every confirmed track still within `max_misses`; coasting ones carry their predicted box.
+
+        Use `track.matched` to tell the tracks that a detection confirmed this frame.
+        """
+        return [t for t in self.tracks if t.hits >= self.min_hits]
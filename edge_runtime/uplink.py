@@ -0,0 +1,176 @@
+import time
+
+import cv2
+import requests
+
+from edge_runtime.bitrate import BitrateController
+from edge_runtime.jpeg import JpegEncoder
+from edge_runtime.telemetry import NULL_TIMER
+
+
+class _BufferBody:
+    """File-like view over an encoded frame.
+
+    requests streams file-like bodies in blocks straight to the socket, so
+    the JPEG goes out without the bytes() copy a `data=buffer.tobytes()` makes.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        self.pos = 0
+
+    def __len__(self):
+        return len(self.view) - self.pos
+
+    def read(self, size=-1):
+        end = len(self.view) if size is None or size < 0 else min(self.pos + size, len(self.view))
+        chunk = self.view[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=0):
+        self.pos = offset if whence == 0 else (self.pos + offset if whence == 1 else len(self.view) + offset)
+        return self.pos
+
+
+class FrameUploader:
+    """JPEG-encodes annotated frames and POSTs them to a dashboard /upload_frame* endpoint.
+
+    The dashboard answers every upload with the rate and quality it wants
+    (see stream_hint in the backend): full rate while someone has the feed
+    open, a keepalive trickle otherwise. Frames that aren't due are skipped
+    before encoding, so an unwatched camera costs almost nothing to stream
+    while detection keeps running on every frame.
+
+    With a BitrateController (the default), quality, resolution, send rate
+    and timeout also follow the measured upload latency and failure rate,
+    never exceeding what the server asked for. `state()` shows both.
+    """
+
+    def __init__(self, url, quality=60, timeout=0.5, encoder=None, follow_hints=True, controller="auto"):
+        self.url = url
+        self.encoder = encoder or JpegEncoder(quality=quality)
+        self.quality = self.encoder.quality  # Our own setting; the server may ask for less while unwatched
+        self.timeout = timeout
+        self.follow_hints = follow_hints
+        if controller == "auto":
+            controller = BitrateController(max_quality=self.quality, min_quality=min(30, self.quality))
+        self.controller = controller         # None = fixed quality/size/timeout, as before
+        self.wanted_fps = None               # Server hint; None = no limit from the server
+        self.wanted_quality = None
+        self.viewers = None
+        self.last_send_time = 0.0
+        self.sent = 0
+        self.telemetry = None  # Set by EdgeRuntime; times "encode" and "upload"
+
+    def timed(self, stage):
+        return self.telemetry.stage(stage) if self.telemetry else NULL_TIMER
+
+    def send_fps(self):
+        rates = [fps for fps in (self.wanted_fps, self.controller and self.controller.fps) if fps]
+        return min(rates) if rates else None
+
+    def due(self, now=None):
+        fps = self.send_fps()
+        if not fps:
+            return True
+        now = time.time() if now is None else now
+        return now - self.last_send_time >= 1.0 / fps
+
+    def _apply_hint(self, response):
+        try:
+            hint = response.json()
+        except ValueError:
+            return
+        if not isinstance(hint, dict) or "wanted_fps" not in hint:
+            return  # Older backend without stream hints
+        self.viewers = hint.get("viewers")
+        self.wanted_fps = hint.get("wanted_fps")
+        self.wanted_quality = hint.get("wanted_quality")
+
+    def _prepare(self, image):
+        """Applies the current quality and resolution; returns the image to encode."""
+        quality = self.controller.quality if self.controller else self.quality
+        if self.wanted_quality:
+            quality = min(quality, self.wanted_quality)
+        self.encoder.quality = quality
+
+        if self.controller and image.shape[1] > self.controller.width:
+            width = self.controller.width
+            height = int(image.shape[0] * width / image.shape[1])
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        return image
+
+    def send(self, image):
+        now = time.time()
+        if not self.due(now):
+            return False
+        self.last_send_time = now
+
+        try:
+            with self.timed("encode"):
+                jpeg = self.encoder.encode(self._prepare(image))
+        except ValueError:
+            return False
+
+        timeout = self.controller.timeout if self.controller else self.timeout
+        started = time.perf_counter()
+        try:
+            with self.timed("upload"):
+                response = requests.post(self.url, data=_BufferBody(jpeg), headers={'Content-Type': 'image/jpeg'}, timeout=timeout)
+            ok = response.ok
+        except Exception:
+            response, ok = None, False  # Silently drop network errors so the video keeps running
+
+        if self.controller:
+            self.controller.record(time.perf_counter() - started, ok)
+        if not ok:
+            return False
+        self.sent += 1
+        if self.follow_hints:
+            self._apply_hint(response)
+        return True
+
+    def state(self):
+        """Where the uploader is at, for debugging: server hint plus controller state."""
+        state = {
+            "url": self.url,
+            "viewers": self.viewers,
+            "wanted_fps": self.wanted_fps,
+            "wanted_quality": self.wanted_quality,
+            "send_fps": self.send_fps(),
+            "quality": self.encoder.quality,
+            "sent": self.sent,
+        }
+        if self.controller:
+            state["controller"] = self.controller.state()
+        return state
+
+
+class AlertClient:
+    """Posts alerts to the dashboard's /alerts endpoint, at most once per cooldown per alert type."""
+
+    def __init__(self, url, cooldown_seconds=10, verbose=True):
+        self.url = url
+        self.cooldown_seconds = cooldown_seconds
+        self.verbose = verbose
+        self.last_alert_time = {}
+
+    def send(self, alert_type, message, now=None):
+        current_time = time.time() if now is None else now
+        if current_time - self.last_alert_time.get(alert_type, 0) <= self.cooldown_seconds:
+            return False
+        try:
+            self.post({"alert_type": alert_type, "message": message})
+            self.last_alert_time[alert_type] = current_time
+            if self.verbose:
+                print(f"🚨 ALERT SENT TO DASHBOARD: {message}")
+            return True
+        except Exception:
+            return False
+
+    def post(self, payload):
+        requests.post(self.url, json=payload, timeout=1)
@@ -0,0 +1,136 @@
+import glob
+import os
+
+import cv2
+import numpy as np
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(MODEL_DIR, "data")
+WEIGHTS_FILE = os.path.join(MODEL_DIR, "drawer_classifier.npz")
+
+
+def load_dataset(data_dir=DATA_DIR):
+    """Returns (images, labels) from data/open and data/closed; label 1 = open."""
+    images, labels = [], []
+    for label, name in ((1, "open"), (0, "closed")):
+        for path in sorted(glob.glob(os.path.join(data_dir, name, "*.jpg"))):
+            image = cv2.imread(path)
+            if image is not None:
+                images.append(image)
+                labels.append(label)
+    return images, np.asarray(labels, dtype=np.int32)
+
+
+def _standardize(x):
+    return (x - x.mean(axis=1, keepdims=True)) / np.maximum(x.std(axis=1, keepdims=True), 1e-6)
+
+
+class DrawerClassifier:
+    """Tiny open/closed classifier: logistic regression on colour + layout features.
+
+    Features are a 16x8 hue/saturation histogram (the open tray shows a lot
+    more bare cardboard) plus a 24x18 grayscale thumbnail. It costs well under
+    a millisecond per frame, so it can run on every frame and decide whether
+    the full YOLO drawer model is worth running.
+    """
+
+    WORK_SIZE = (64, 48)
+    THUMB_SIZE = (24, 18)
+    HIST_BINS = [16, 8]
+
+    def __init__(self, weights=None, bias=0.0):
+        self.weights = weights
+        self.bias = bias
+
+    @classmethod
+    def features(cls, frames):
+        hists, thumbs = [], []
+        for frame in frames:
+            small = cv2.resize(frame, cls.WORK_SIZE, interpolation=cv2.INTER_AREA)
+            hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+            hist = cv2.calcHist([hsv], [0, 1], None, cls.HIST_BINS, [0, 180, 0, 256]).reshape(-1)
+            hists.append(hist / max(hist.sum(), 1.0))
+
+            thumb = cv2.resize(small, cls.THUMB_SIZE, interpolation=cv2.INTER_AREA)
+            thumbs.append(cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY).reshape(-1))
+
+        # Halve the thumbnail's weight so the much longer vector doesn't drown out the histogram
+        return np.hstack([
+            _standardize(np.asarray(hists, dtype=np.float32)),
+            0.5 * _standardize(np.asarray(thumbs, dtype=np.float32)),
+        ])
+
+    def fit(self, frames, labels, epochs=500, lr=0.05, l2=1e-3):
+        x = self.features(frames)
+        y = np.asarray(labels, dtype=np.float32)
+        self.weights = np.zeros(x.shape[1], dtype=np.float32)
+        self.bias = 0.0
+
+        for _ in range(epochs):
+            p = 1.0 / (1.0 + np.exp(-(x @ self.weights + self.bias)))
+            grad = p - y
+            self.weights -= lr * (x.T @ grad / len(y) + l2 * self.weights)
+            self.bias -= lr * float(grad.mean())
+        return self
+
+    def predict_batch(self, frames):
+        """Probability that the drawer is open, one per frame."""
+        logits = self.features(frames) @ self.weights + self.bias
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def save(self, path=WEIGHTS_FILE):
+        np.savez(path, weights=self.weights, bias=self.bias)
+
+    @classmethod
+    def load(cls, path=WEIGHTS_FILE):
+        data = np.load(path)
+        return cls(data["weights"], float(data["bias"]))
+
+
+class TFLiteDrawerClassifier:
+    """Open/closed classifier on the TFLite interpreter, with batched inference.
+
+    Expects an image classifier with a single (N, 1) sigmoid or (N, 2)
+    [closed, open] output. Uses tflite_runtime if installed, else TensorFlow.
+    """
+
+    def __init__(self, model_path, num_threads=2, batch_size=8):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.batch_size = batch_size
+        self.input = self.interpreter.get_input_details()[0]
+        outputs = self.interpreter.get_output_details()
+
+        if len(outputs) != 1 or outputs[0]["shape"][-1] not in (1, 2) or len(outputs[0]["shape"]) != 2:
+            shapes = [list(o["shape"]) for o in outputs]
+            raise ValueError(f"{model_path} is not an open/closed classifier (outputs: {shapes})")
+        self.output = outputs[0]
+
+        _, self.height, self.width, _ = self.input["shape"]
+        self.interpreter.resize_tensor_input(self.input["index"], [batch_size, self.height, self.width, 3])
+        self.interpreter.allocate_tensors()
+        self.input_buffer = np.zeros((batch_size, self.height, self.width, 3), dtype=self.input["dtype"])
+
+    def predict_batch(self, frames):
+        probs = np.empty(len(frames), dtype=np.float32)
+        for start in range(0, len(frames), self.batch_size):
+            chunk = frames[start:start + self.batch_size]
+            for i, frame in enumerate(chunk):
+                rgb = cv2.cvtColor(cv2.resize(frame, (self.width, self.height)), cv2.COLOR_BGR2RGB)
+                if self.input["dtype"] == np.float32:
+                    self.input_buffer[i] = rgb.astype(np.float32) / 127.5 - 1.0
+                else:
+                    self.input_buffer[i] = rgb
+
+            self.interpreter.set_tensor(self.input["index"], self.input_buffer)
+            self.interpreter.invoke()
+            out = self.interpreter.get_tensor(self.output["index"])[:len(chunk)].astype(np.float32)
+            scale, zero_point = self.output.get("quantization", (0.0, 0))
+            if scale:
+                out = (out - zero_point) * scale
+            probs[start:start + len(chunk)] = out[:, 1] if out.shape[1] == 2 else out[:, 0]
+        return probs
@@ -0,0 +1,68 @@
+import cv2
+
+# Shared between the live node (5mon.py) and the offline analyzer (forensic_batch.py)
+STND_H = 580
+TRIGGER_LINE = 420
+CURRENCY_VALUES = [10, 500, 100, 200, 2000]
+
+
+def resize_to_standard(frame):
+    """Scales a frame to STND_H pixels high, which TRIGGER_LINE is calibrated against."""
+    h, w = frame.shape[:2]
+    return cv2.resize(frame, (int(w * (STND_H / h)), STND_H))
+
+
+def box_area(box):
+    x1, y1, x2, y2 = box
+    return (x2 - x1) * (y2 - y1)
+
+
+def largest_box(boxes):
+    """The biggest (x1, y1, x2, y2) box, or None."""
+    if len(boxes) == 0:
+        return None
+    return max(boxes, key=box_area)
+
+
+def is_drawer_open(drawer_box):
+    return int(drawer_box[3]) > TRIGGER_LINE
+
+
+def drawer_roi(drawer_box, frame_shape, pad=0.25):
+    """Padded crop (x1, y1, x2, y2) around the drawer for hand landmarking, clipped to the frame.
+
+    The top gets twice the padding: a hand reaches in from above, and the
+    landmarker needs to see the palm, not just the fingers in the slot.
+    """
+    h, w = frame_shape[:2]
+    x1, y1, x2, y2 = drawer_box
+    pad_x, pad_y = (x2 - x1) * pad, (y2 - y1) * pad
+    return (
+        int(max(0, x1 - pad_x)), int(max(0, y1 - 2 * pad_y)),
+        int(min(w, x2 + pad_x)), int(min(h, y2 + pad_y))
+    )
+
+
+def fingertip(hand_landmarks, frame_shape, origin=(0, 0)):
+    """Index fingertip (landmark 8) of the first hand, in pixels.
+
+    If the landmarks came from a crop, pass the crop's shape and its top-left
+    corner as `origin` to get full-frame coordinates back.
+    """
+    landmarks = hand_landmarks[0]
+    return (
+        origin[0] + int(landmarks[8].x * frame_shape[1]),
+        origin[1] + int(landmarks[8].y * frame_shape[0])
+    )
+
+
+def slot_value(drawer_box, itx):
+    """Currency value of the drawer slot under x = itx, or None if the finger is outside the drawer."""
+    dx1, _, dx2, _ = map(int, drawer_box)
+    if not dx1 < itx < dx2:
+        return None
+
+    drawer_w = dx2 - dx1
+    rel_x = (itx - dx1) - (drawer_w * 0.05)
+    slot_idx = max(0, min(int(rel_x // (drawer_w / 5)), 4))
+    return CURRENCY_VALUES[slot_idx]
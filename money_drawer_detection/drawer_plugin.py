@@ -0,0 +1,173 @@
+import os
+import sys
+
+import cv2
+import mediapipe as mp
+import numpy as np
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+from ultralytics import YOLO
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edge_runtime.motion import AdaptiveCadence
+from edge_runtime.runtime import Plugin
+from edge_runtime.tracking import BoxTracker
+from drawer_classifier import WEIGHTS_FILE, DrawerClassifier
+from drawer_logic import TRIGGER_LINE, box_area, is_drawer_open, drawer_roi, fingertip, slot_value
+
+# The cash drawer detector behind 5mon.py. Frames must already be resize_to_standard()-ed,
+# since TRIGGER_LINE is calibrated against that height.
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class DrawerPlugin(Plugin):
+    """YOLO drawer box + hand landmarks: which slot a hand reaches into while the drawer is open.
+
+    Two models with their own cadences, so step() is overridden: YOLO (gated
+    on motion, or optionally by the cheap open/closed classifier) and the hand
+    landmarker (only while the drawer is open, on a crop around it).
+    """
+
+    name = "drawer"
+    active_every = 1
+    idle_every = 10
+    floor_seconds = 1.0
+
+    # Optional cheap open/closed classifier (see eval_drawer_classifier.py). While it is confident
+    # the drawer is shut, YOLO drops to its idle rate even if people are moving around the counter.
+    DRAWER_GATE_THRESHOLD = 0.2
+    # Until the gate has said "open" once, it is unproven on this camera and motion decides;
+    # after this many moving-scene frames without a single "open" it is switched off
+    DRAWER_GATE_SILENT_LIMIT = 300
+    ALERT_COOLDOWN = 2.0
+
+    def __init__(self, alerts, hand_roi_mode=True, hand_roi_pad=0.25, drawer_gate=False):
+        super().__init__()
+        self.alerts = alerts
+        self.yolo_model = YOLO(os.path.join(MODEL_DIR, 'best.pt'))
+
+        options = vision.HandLandmarkerOptions(
+            base_options=python.BaseOptions(model_asset_path=os.path.join(MODEL_DIR, 'hand_landmarker.task')),
+            num_hands=1,
+            running_mode=vision.RunningMode.VIDEO
+        )
+        self.detector = vision.HandLandmarker.create_from_options(options)
+        self.hand_cadence = AdaptiveCadence(active_every=1, idle_every=10, floor_seconds=1.0)
+        self.hand_result = None
+        self.hand_origin, self.hand_shape = (0, 0), None
+
+        # Off by default: the shipped weights come from the landscape webcam images in data/ and
+        # never reach the threshold on the deployed portrait camera. Enable after retraining on its footage.
+        self.drawer_gate = DrawerClassifier.load(WEIGHTS_FILE) if drawer_gate and os.path.exists(WEIGHTS_FILE) else None
+        self.gate_fired = False
+        self.gate_silent_frames = 0
+
+        # Hand landmarking only while the drawer is open, and only on a padded crop around it.
+        # Set to False to landmark the whole frame on every hand_cadence tick, as before.
+        self.hand_roi_mode = hand_roi_mode
+        self.hand_roi_pad = hand_roi_pad
+
+        # The drawer is tracked so we stay locked onto the same box instead of re-picking the largest one every frame
+        self.drawer_tracker = BoxTracker(iou_threshold=0.3, high_score=0.4, max_misses=5)
+        self.drawer_track_id = None
+        self.drawer_track = None
+
+        self.total_stolen = 0
+        self.last_alert_time = 0
+
+    def is_active(self, frame):
+        if self.drawer_gate is None or not frame.scene_active:
+            return frame.scene_active
+
+        drawer_open = self.drawer_gate.predict_batch([frame.image])[0] > self.DRAWER_GATE_THRESHOLD
+        if drawer_open:
+            self.gate_fired = True
+        if self.gate_fired:
+            return drawer_open
+
+        self.gate_silent_frames += 1
+        if self.gate_silent_frames >= self.DRAWER_GATE_SILENT_LIMIT:
+            print(f"⚠️ Drawer gate never saw an open drawer in {self.gate_silent_frames} moving frames; "
+                  "falling back to motion gating (retrain drawer_classifier.npz on this camera)")
+            self.drawer_gate = None
+        return frame.scene_active
+
+    def step(self, frame):
+        with self.timed("gate"):
+            yolo_active = self.is_active(frame)
+        if self.cadence.should_run(yolo_active, now=frame.time):
+            with self.timed("yolo"):
+                yolo_boxes = self.yolo_model(frame.image, conf=0.25, verbose=False)[0].boxes
+            tracks = self.drawer_tracker.update(yolo_boxes.xyxy.cpu().numpy(), yolo_boxes.conf.cpu().numpy(), yolo_boxes.cls.cpu().numpy().astype(int))
+        else:
+            tracks = self.drawer_tracker.predict()
+
+        if not self.hand_roi_mode and self.hand_cadence.should_run(frame.scene_active, now=frame.time):
+            with self.timed("hands"):
+                self.hand_result = self.detector.detect_for_video(frame.mp_image, frame.timestamp_ms)
+            self.hand_origin, self.hand_shape = (0, 0), frame.shape
+
+        drawer_track = next((t for t in tracks if t.track_id == self.drawer_track_id), None)
+        if drawer_track is None and tracks:
+            # Lost the drawer (or first frame): lock onto the largest box
+            drawer_track = max(tracks, key=lambda t: box_area(t.box))
+            self.drawer_track_id = drawer_track.track_id
+        self.drawer_track = drawer_track
+
+        if self.hand_roi_mode:
+            roi = drawer_roi(drawer_track.box, frame.shape, self.hand_roi_pad) if drawer_track else None
+            if roi and is_drawer_open(drawer_track.box) and roi[2] > roi[0] and roi[3] > roi[1]:
+                if self.hand_cadence.should_run(frame.scene_active, now=frame.time):
+                    rx1, ry1, rx2, ry2 = roi
+                    # Crop the frame's shared RGB copy instead of converting the crop again
+                    crop = np.ascontiguousarray(frame.rgb[ry1:ry2, rx1:rx2])
+                    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=crop)
+                    with self.timed("hands"):
+                        self.hand_result = self.detector.detect_for_video(mp_image, frame.timestamp_ms)
+                    self.hand_origin, self.hand_shape = (rx1, ry1), crop.shape
+            else:
+                self.hand_result = None
+
+        with self.timed("annotate"):
+            self.render(frame)
+
+    def render(self, frame):
+        canvas = frame.canvas
+        drawer_track = self.drawer_track
+
+        if drawer_track:
+            dx1, dy1, dx2, dy2 = map(int, drawer_track.box)
+            drawer_open = is_drawer_open(drawer_track.box)
+
+            drawer_status = "THEFT RISK: OPEN" if drawer_open else "SECURE: CLOSED"
+            drawer_color = (0, 0, 255) if drawer_open else (0, 255, 0)
+
+            cv2.rectangle(canvas, (dx1, dy1), (dx2, dy2), drawer_color, 3)
+            cv2.putText(canvas, drawer_status, (dx1, dy1 - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, drawer_color, 2)
+
+            if drawer_open and self.hand_result and self.hand_result.hand_landmarks:
+                itx, ity = fingertip(self.hand_result.hand_landmarks, self.hand_shape, self.hand_origin)
+                val = slot_value(drawer_track.box, itx)
+
+                if val is not None:
+                    current_time = frame.time
+                    if current_time - self.last_alert_time > self.ALERT_COOLDOWN:
+                        self.total_stolen += val
+
+                        msg = f"CASH DRAWER THEFT! Stolen: {val} INR | Total Loss: {self.total_stolen} INR"
+                        print(f"🚨 {msg}")
+                        self.alerts.send("theft", msg, now=current_time)
+                        self.last_alert_time = current_time
+
+                    # Hover Visuals
+                    cv2.rectangle(canvas, (itx - 65, ity - 65), (itx + 65, ity - 25), (0, 0, 0), -1)
+                    cv2.putText(canvas, f"VAL: {val}", (itx - 55, ity - 40),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.circle(canvas, (itx, ity), 8, (255, 255, 255), -1)
+
+        cv2.line(canvas, (0, TRIGGER_LINE), (canvas.shape[1], TRIGGER_LINE), (255, 0, 0), 2)
+
+    def close(self):
+        self.detector.close()
@@ -0,0 +1,88 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from drawer_classifier import DATA_DIR, MODEL_DIR, WEIGHTS_FILE, DrawerClassifier, TFLiteDrawerClassifier, load_dataset
+from drawer_logic import resize_to_standard, largest_box, is_drawer_open
+
+# Accuracy and throughput of the cheap open/closed classifiers against the YOLO path on data/.
+#
+#   python eval_drawer_classifier.py --save          # cross-validate, then train on everything and save
+#   python eval_drawer_classifier.py --tflite m.tflite --no-yolo
+
+
+def throughput(predict, images, batch_size, repeats=3):
+    """Best-of-N images/s for predict(list_of_images) over the whole set in batches."""
+    best = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for i in range(0, len(images), batch_size):
+            predict(images[i:i + batch_size])
+        best = max(best, len(images) / (time.perf_counter() - start))
+    return best
+
+
+def cross_validate(images, labels, folds=5, seed=0):
+    """Out-of-fold predictions, so the reported accuracy isn't measured on training images."""
+    order = np.random.default_rng(seed).permutation(len(images))
+    predictions = np.zeros(len(images), dtype=np.int32)
+    for fold in np.array_split(order, folds):
+        train = np.setdiff1d(order, fold)
+        model = DrawerClassifier().fit([images[i] for i in train], labels[train])
+        predictions[fold] = model.predict_batch([images[i] for i in fold]) > 0.5
+    return predictions
+
+
+def report(name, predictions, labels, images_per_s):
+    accuracy = float(np.mean(predictions == labels))
+    print(f"{name:<24} accuracy {accuracy:6.1%} | {images_per_s:8.1f} images/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drawer open/closed classifier evaluation and benchmark")
+    parser.add_argument("--data", default=DATA_DIR)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--save", action="store_true", help=f"Train on all of data/ and write {os.path.basename(WEIGHTS_FILE)}")
+    parser.add_argument("--tflite", help="Also evaluate a TFLite open/closed classifier")
+    parser.add_argument("--threads", type=int, default=2, help="TFLite interpreter threads")
+    parser.add_argument("--no-yolo", action="store_true", help="Skip the best.pt baseline")
+    args = parser.parse_args()
+
+    images, labels = load_dataset(args.data)
+    print(f"📂 {len(images)} images ({int(labels.sum())} open, {int((labels == 0).sum())} closed)")
+
+    predictions = cross_validate(images, labels)
+    model = DrawerClassifier().fit(images, labels)
+    report("colour+thumb logreg (5-fold)", predictions, labels,
+           throughput(model.predict_batch, images, args.batch_size))
+    if args.save:
+        model.save()
+        print(f"💾 Saved {WEIGHTS_FILE}")
+
+    if args.tflite:
+        tflite = TFLiteDrawerClassifier(args.tflite, num_threads=args.threads, batch_size=args.batch_size)
+        report(f"tflite ({args.threads} threads)", tflite.predict_batch(images) > 0.5, labels,
+               throughput(tflite.predict_batch, images, args.batch_size))
+
+    if not args.no_yolo:
+        from ultralytics import YOLO
+        yolo = YOLO(os.path.join(MODEL_DIR, "best.pt"))
+
+        def yolo_predict(batch):
+            # Same rule as the live node: largest box crossing TRIGGER_LINE means open
+            results = yolo([resize_to_standard(image) for image in batch], conf=0.4, verbose=False)
+            out = []
+            for result in results:
+                box = largest_box(result.boxes.xyxy.cpu().numpy())
+                out.append(box is not None and is_drawer_open(box))
+            return np.asarray(out, dtype=np.int32)
+
+        yolo_predictions = np.concatenate([yolo_predict(images[i:i + args.batch_size])
+                                           for i in range(0, len(images), args.batch_size)])
+        report("YOLO best.pt", yolo_predictions, labels, throughput(yolo_predict, images, args.batch_size, repeats=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import mediapipe as mp
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+from ultralytics import YOLO
+
+from drawer_logic import resize_to_standard, largest_box, is_drawer_open, drawer_roi, fingertip, slot_value
+
+# Offline version of 5mon.py for auditing recorded footage faster than real time.
+# The video is cut into chunks by frame index, each chunk is analysed in its own
+# process with batched YOLO, and the per-frame results are merged into a timeline.
+#
+#   python forensic_batch.py raw_theft_video.mp4 --workers 4 --output timeline.json
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Per-process models, loaded once by the pool initializer
+_yolo = None
+_hands = None
+
+
+def _init_worker(threads_per_worker):
+    global _yolo, _hands
+    import torch
+
+    # Each process gets a slice of the CPU instead of every process fighting for all cores
+    torch.set_num_threads(threads_per_worker)
+    cv2.setNumThreads(threads_per_worker)
+
+    _yolo = YOLO(os.path.join(MODEL_DIR, "best.pt"))
+    options = vision.HandLandmarkerOptions(
+        base_options=python.BaseOptions(model_asset_path=os.path.join(MODEL_DIR, "hand_landmarker.task")),
+        num_hands=1,
+        running_mode=vision.RunningMode.IMAGE
+    )
+    _hands = vision.HandLandmarker.create_from_options(options)
+
+
+def _analyze_batch(frames):
+    """Returns one (drawer_open, slot_value) pair per frame. Each frame is judged on its own,
+    so results don't depend on where the chunk boundaries fall."""
+    results = _yolo(frames, conf=0.4, verbose=False)
+    records = []
+
+    for frame, result in zip(frames, results):
+        drawer_box = largest_box(result.boxes.xyxy.cpu().numpy())
+        if drawer_box is None or not is_drawer_open(drawer_box):
+            records.append((False, None))
+            continue
+
+        # Hands only matter while the drawer is open, so only then (and only around it) pay for the landmarker
+        rx1, ry1, rx2, ry2 = drawer_roi(drawer_box, frame.shape)
+        crop = frame[ry1:ry2, rx1:rx2]
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+        hand_result = _hands.detect(mp_image)
+        value = None
+        if hand_result.hand_landmarks:
+            itx, _ = fingertip(hand_result.hand_landmarks, crop.shape, (rx1, ry1))
+            value = slot_value(drawer_box, itx)
+        records.append((True, value))
+
+    return records
+
+
+def analyze_chunk(job):
+    """Analyses frames [start, end) of the video. Returns a list of (frame_idx, drawer_open, slot_value);
+    it ends early if a frame fails to decode, so it can be shorter than the range."""
+    video_path, start, end, batch_size = job
+    cap = cv2.VideoCapture(video_path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    records = []
+    frames = []
+    frame_idx = start
+    while frame_idx < end:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(resize_to_standard(frame))
+        frame_idx += 1
+
+        if len(frames) == batch_size:
+            records.extend(_analyze_batch(frames))
+            frames = []
+
+    if frames:
+        records.extend(_analyze_batch(frames))
+    cap.release()
+
+    return [(start + i, drawer_open, value) for i, (drawer_open, value) in enumerate(records)]
+
+
+def _with_breaks(records, gaps):
+    """`records` with a closed-drawer, no-hand record wherever frames are missing, and one at the end.
+
+    A chunk stops at the first frame it can't decode (and CAP_PROP_FRAME_COUNT
+    often overestimates), so the concatenated records can skip frames; the break
+    ends any run at the last frame actually seen. Each skipped range is added to `gaps`.
+    """
+    expected = 0
+    for record in records:
+        if record[0] != expected:
+            gaps.append({"start_frame": expected, "end_frame": record[0] - 1})
+            yield expected, False, None
+        yield record
+        expected = record[0] + 1
+    yield expected, False, None
+
+
+def build_timeline(records, fps):
+    """Merges per-frame records into drawer-open intervals and hand-in-slot events."""
+    def seconds(frame_idx):
+        return round(frame_idx / fps, 3)
+
+    drawer_open = []
+    hand_in_slot = []
+    gaps = []
+    open_start = None
+    slot_start, slot_val = None, None
+
+    for frame_idx, is_open, value in _with_breaks(records, gaps):
+        if is_open and open_start is None:
+            open_start = frame_idx
+        elif not is_open and open_start is not None:
+            drawer_open.append({
+                "start_frame": open_start, "end_frame": frame_idx - 1,
+                "start_s": seconds(open_start), "end_s": seconds(frame_idx - 1)
+            })
+            open_start = None
+
+        # A hand event is a run of consecutive frames with the fingertip over the same slot
+        if value != slot_val:
+            if slot_val is not None:
+                hand_in_slot.append({
+                    "start_frame": slot_start, "end_frame": frame_idx - 1,
+                    "start_s": seconds(slot_start), "end_s": seconds(frame_idx - 1),
+                    "value": slot_val
+                })
+            slot_start, slot_val = frame_idx, value
+
+    return {
+        "fps": fps,
+        "frames": len(records),
+        "missing_frames": gaps,
+        "drawer_open": drawer_open,
+        "hand_in_slot": hand_in_slot,
+        "total_value": sum(event["value"] for event in hand_in_slot)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline cash-drawer forensic analysis")
+    parser.add_argument("video", nargs="?", default="raw_theft_video.mp4")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--chunk-frames", type=int, default=600)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--threads-per-worker", type=int, default=2)
+    parser.add_argument("--output", help="Write the timeline JSON here instead of stdout")
+    args = parser.parse_args()
+
+    cap = cv2.VideoCapture(args.video)
+    if not cap.isOpened():
+        print(f"❌ Could not open {args.video}")
+        return
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+
+    jobs = [
+        (args.video, start, min(start + args.chunk_frames, total_frames), args.batch_size)
+        for start in range(0, total_frames, args.chunk_frames)
+    ]
+    print(f"🎞️  {total_frames} frames @ {fps:.1f} fps -> {len(jobs)} chunks on {args.workers} workers")
+
+    started = time.time()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.threads_per_worker,)) as pool:
+        records = [record for chunk in pool.map(analyze_chunk, jobs) for record in chunk]
+    elapsed = time.time() - started
+
+    timeline = build_timeline(records, fps)
+    print(f"✅ Analysed {len(records)} frames in {elapsed:.1f}s "
+          f"({len(records) / max(elapsed, 1e-6):.0f} fps, {len(records) / fps / max(elapsed, 1e-6):.1f}x real time)")
+    if timeline["missing_frames"]:
+        print(f"⚠️ {len(timeline['missing_frames'])} stretches of frames could not be decoded; "
+              f"intervals end at each one (see missing_frames)")
+    print(f"🚨 {len(timeline['drawer_open'])} drawer openings, {len(timeline['hand_in_slot'])} hand-in-slot events")
+
+    output = json.dumps(timeline, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edge_runtime.runtime import Plugin
+from edge_runtime.tracking import BoxTracker
+from pose_features import PACING_CROSSINGS, PACING_SECONDS, PoseTracker, is_looking_around, is_touching_pocket, side_crossings
+
+# Detector plugins behind Serv.py, usable on their own or alongside others in edge_node.py
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class PosePlugin(Plugin):
+    """MediaPipe pose for up to `max_people` people: looking around, pacing and pocket touching.
+
+    Each person is tracked with their own landmark history (pose_features.py),
+    so two cashiers' counts never mix and one noisy frame doesn't reset them.
+    """
+
+    name = "pose"
+    active_every = 1
+    idle_every = 10
+    floor_seconds = 1.0
+
+    def __init__(self, alerts, max_people=4):
+        super().__init__()
+        self.alerts = alerts
+        options = vision.PoseLandmarkerOptions(
+            base_options=python.BaseOptions(model_asset_path=os.path.join(MODEL_DIR, 'pose_landmarker.task')),
+            running_mode=vision.RunningMode.VIDEO,
+            num_poses=max_people
+        )
+        self.detector = vision.PoseLandmarker.create_from_options(options)
+        self.people = PoseTracker()
+
+        # Pose results are kept between runs so the overlay doesn't flicker
+        self.last_people = []  # [(person_id, (33, 2) landmarks)]
+        self.pose_alerts = []
+
+        self.pacing_since = 0.0  # 'r' restarts every person's pacing count, from the next frame on
+        self.reset_pacing = False
+
+    def process(self, frame):
+        pose_result = self.detector.detect_for_video(frame.mp_image, frame.timestamp_ms)
+        poses = [np.array([(p.x, p.y) for p in lm], dtype=np.float32) for lm in pose_result.pose_landmarks]
+        h, w = frame.shape[:2]
+        people = self.people.update(poses, w, h, frame.time)
+        if self.reset_pacing:
+            self.pacing_since, self.reset_pacing = frame.time, False
+
+        self.pose_alerts = []
+        self.last_people = [(person_id, history.latest) for person_id, history in people]
+
+        for person_id, history in people:
+            # Logic 1: Stable Scanning
+            if is_looking_around(history, frame.time):
+                msg = f"SUSPICIOUS: LOOKING AROUND (#{person_id})"
+                self.pose_alerts.append((msg, (0, 0, 255)))
+                self.alerts.send("looking", msg, now=frame.time)
+
+            # Logic 2: Pacing
+            crossings = side_crossings(history, max(self.pacing_since, frame.time - PACING_SECONDS))
+            if crossings > PACING_CROSSINGS:
+                msg = f"SUSPICIOUS: PACING ({crossings}) (#{person_id})"
+                self.pose_alerts.append((msg, (0, 165, 255)))
+                self.alerts.send("pacing", msg, now=frame.time)
+
+            # Logic 3: Pocket Touching
+            if is_touching_pocket(history, frame.time):
+                msg = f"SUSPICIOUS: POCKET TOUCHING (#{person_id})"
+                self.pose_alerts.append((msg, (255, 0, 255)))
+                self.alerts.send("pocket", msg, now=frame.time)
+
+    def skip(self, frame):
+        self.people.predict()
+
+    def render(self, frame):
+        frame.alerts.extend(self.pose_alerts)
+
+        h, w = frame.shape[:2]
+        for person_id, landmarks in self.last_people:
+            for idx in [0, 7, 8, 11, 12, 16, 24]:
+                cx, cy = int(landmarks[idx][0] * w), int(landmarks[idx][1] * h)
+                cv2.circle(frame.canvas, (cx, cy), 5, (255, 255, 255), -1)
+            nx, ny = int(landmarks[0][0] * w), int(landmarks[0][1] * h)
+            cv2.putText(frame.canvas, f"#{person_id}", (nx + 8, ny - 8), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+
+    def on_key(self, key):
+        if key == ord('r'):
+            self.reset_pacing = True
+
+    def close(self):
+        self.detector.close()
+
+
+class ObjectPlugin(Plugin):
+    """YOLOv8 COCO objects: phone use, long queue, unattended POS.
+
+    Runs after PosePlugin so "POS Status: SECURE" only shows when neither
+    plugin raised anything this frame.
+    """
+
+    name = "objects"
+    active_every = 3
+    idle_every = 15
+    floor_seconds = 2.0
+
+    def __init__(self, alerts):
+        super().__init__()
+        self.alerts = alerts
+        self.model = YOLO("yolov8n.pt")
+        # Tracks carry YOLO boxes (with stable IDs) across the frames where YOLO is skipped.
+        # Boxes below 0.35 can only keep an existing track alive, never start one.
+        self.tracker = BoxTracker(iou_threshold=0.3, high_score=0.35, max_misses=3)
+        self.tracks = []
+
+    def process(self, frame):
+        results = self.model.predict(source=frame.image, conf=0.2, imgsz=320, verbose=False)
+        boxes = results[0].boxes
+        self.tracks = self.tracker.update(boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy().astype(int))
+
+    def skip(self, frame):
+        self.tracks = self.tracker.predict()
+
+    def render(self, frame):
+        canvas = frame.canvas
+        persons_count = 0
+        phones_count = 0
+
+        for track in self.tracks:
+            x1, y1, x2, y2 = map(int, track.box)
+            cls_name = self.model.names[int(track.label)]
+            conf = track.score
+
+            if cls_name == "person":
+                persons_count += 1
+                cv2.rectangle(canvas, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                cv2.putText(canvas, f"Person #{track.track_id} {conf:.2f}", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+
+            elif cls_name == "cell phone":
+                phones_count += 1
+                cv2.rectangle(canvas, (x1, y1), (x2, y2), (0, 0, 255), 2)
+                cv2.putText(canvas, "PHONE DETECTED", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+
+            elif cls_name in ["laptop", "cup", "bottle", "keyboard", "mouse"]:
+                cv2.rectangle(canvas, (x1, y1), (x2, y2), (255, 140, 0), 2)
+                cv2.putText(canvas, cls_name, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 140, 0), 1)
+
+        if phones_count > 0:
+            msg = "ANOMALY: STAFF USING PHONE!"
+            frame.alerts.append((msg, (0, 0, 255)))
+            self.alerts.send("phone", msg, now=frame.time)
+        elif persons_count > 3:
+            msg = "WARNING: LONG QUEUE"
+            frame.alerts.append((msg, (0, 165, 255)))
+            self.alerts.send("queue", msg, now=frame.time)
+        elif persons_count == 0:
+            msg = "ALERT: POS UNATTENDED"
+            frame.alerts.append((msg, (0, 255, 255)))
+            self.alerts.send("unattended", msg, now=frame.time)
+        elif not frame.alerts:  # Only say secure if NO alerts (YOLO or Pose) are active
+            frame.alerts.append(("POS Status: SECURE", (0, 255, 0)))
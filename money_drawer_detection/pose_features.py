@@ -0,0 +1,136 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from edge_runtime.tracking import BoxTracker
+
+# Per-person pose history and the behaviour features PosePlugin alerts on.
+# Every feature is a NumPy expression over a window of one person's history,
+# so a single bad frame shifts a count by one instead of resetting it.
+
+NUM_LANDMARKS = 33
+NOSE, L_SHOULDER, R_SHOULDER, L_WRIST, R_WRIST, L_HIP, R_HIP = 0, 11, 12, 15, 16, 23, 24
+
+# Windows are in seconds of frame time, so they mean the same at the plugin's idle cadence.
+# A window needs MIN_WINDOW_SAMPLES before it can fire, so one stray frame never does.
+MIN_WINDOW_SAMPLES = 2
+
+# Looking around: nose off the shoulder centre in most of the last half second
+LOOK_SECONDS = 0.5
+LOOK_MIN_FRACTION = 0.7
+LOOK_DEVIATION = 0.2
+
+# Pacing: crossings of the frame's centre line within the time window
+PACING_SECONDS = 60.0
+PACING_CROSSINGS = 5
+PACING_DEADBAND = 0.03  # Wobbling right on the line isn't a crossing
+
+# Pocket touching: a wrist by the same-side hip in most of the last 2/3 second
+POCKET_SECONDS = 0.67
+POCKET_MIN_FRACTION = 0.8
+POCKET_DISTANCE = 0.12
+
+
+class PoseHistory:
+    """Ring buffer of one person's normalized (x, y) landmarks and their timestamps."""
+
+    def __init__(self, capacity=2048):
+        self.points = np.zeros((capacity, NUM_LANDMARKS, 2), dtype=np.float32)
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.count = 0  # Total ever appended; the buffer holds the last min(count, capacity)
+
+    def append(self, points, now):
+        i = self.count % len(self.times)
+        self.points[i] = points
+        self.times[i] = now
+        self.count += 1
+
+    def _indices(self, n):
+        n = min(n, self.count, len(self.times))
+        return np.arange(self.count - n, self.count) % len(self.times)
+
+    def since(self, start, landmarks):
+        """Samples of `landmarks` at or after time `start`, oldest first."""
+        idx = self._indices(len(self.times))
+        return self.points[idx[self.times[idx] >= start][:, None], np.asarray(landmarks)[None, :]]
+
+    @property
+    def latest(self):
+        return self.points[(self.count - 1) % len(self.times)] if self.count else None
+
+
+def _mostly(hits, fraction):
+    return len(hits) >= MIN_WINDOW_SAMPLES and np.count_nonzero(hits) >= fraction * len(hits)
+
+
+def look_deviation(history, now):
+    """Nose offset from the shoulder centre, in shoulder widths, for the samples of the last LOOK_SECONDS."""
+    pts = history.since(now - LOOK_SECONDS, [NOSE, L_SHOULDER, R_SHOULDER])[..., 0]
+    shoulder_width = np.abs(pts[:, 2] - pts[:, 1]) + 0.001
+    return (pts[:, 0] - (pts[:, 1] + pts[:, 2]) / 2) / shoulder_width
+
+
+def is_looking_around(history, now):
+    return _mostly(np.abs(look_deviation(history, now)) > LOOK_DEVIATION, LOOK_MIN_FRACTION)
+
+
+def side_crossings(history, start):
+    """How often the shoulder midpoint switched halves of the frame since `start`."""
+    mid_x = history.since(start, [L_SHOULDER, R_SHOULDER])[..., 0].mean(axis=1) - 0.5
+    side = np.sign(mid_x[np.abs(mid_x) >= PACING_DEADBAND])  # Samples in the deadband keep the previous side
+    return int(np.count_nonzero(side[1:] != side[:-1]))
+
+
+def is_touching_pocket(history, now):
+    pts = history.since(now - POCKET_SECONDS, [L_WRIST, L_HIP, R_WRIST, R_HIP])
+    left = np.linalg.norm(pts[:, 0] - pts[:, 1], axis=1)
+    right = np.linalg.norm(pts[:, 2] - pts[:, 3], axis=1)
+    return _mostly(np.minimum(left, right) < POCKET_DISTANCE, POCKET_MIN_FRACTION)
+
+
+class PoseTracker:
+    """Keeps each detected pose attached to the same person (and PoseHistory) across frames.
+
+    Identity comes from BoxTracker on the landmarks' bounding boxes, in
+    pixels, so people keep their IDs while walking past each other.
+    """
+
+    def __init__(self, max_misses=5, capacity=2048):
+        self.tracker = BoxTracker(iou_threshold=0.2, high_score=0.5, max_misses=max_misses)
+        self.capacity = capacity
+        self.histories = {}  # track_id -> PoseHistory
+
+    def update(self, poses, width, height, now):
+        """`poses`: list of (33, 2) normalized landmark arrays. Returns [(track_id, PoseHistory)] of everyone tracked.
+
+        That includes people whose pose was missed this frame (until the tracker
+        drops them), so overlays and windows don't blink; only matched poses
+        are added to a history.
+        """
+        if poses:
+            points = np.stack(poses)
+            boxes = np.concatenate([points.min(axis=1), points.max(axis=1)], axis=1) * [width, height, width, height]
+        else:
+            boxes = np.zeros((0, 4), dtype=np.float32)
+        tracks = self.tracker.update(boxes, np.ones(len(boxes)), np.zeros(len(boxes), dtype=int))
+
+        people = []
+        for track in tracks:
+            history = self.histories.get(track.track_id)
+            if track.matched:
+                if history is None:
+                    history = self.histories[track.track_id] = PoseHistory(self.capacity)
+                history.append(poses[track.detection], now)
+            if history is not None:
+                people.append((track.track_id, history))
+
+        live = {track.track_id for track in self.tracker.tracks}
+        for track_id in list(self.histories):
+            if track_id not in live:
+                del self.histories[track_id]
+        return people
+
+    def predict(self):
+        self.tracker.predict()
@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import sys
+
+from edge_runtime.replay import ReplayClock, RecordingAlerts, iter_frames, replay
+
+# Replays recorded footage through the edge detectors with a fixed frame clock and
+# no network, then reports fps, per-frame latency percentiles and every alert. Save a
+# run with --output and check a later version against it with --compare: the speed
+# may change, the detections digest must not.
+#
+#   python replay_benchmark.py pos --output before.json
+#   python replay_benchmark.py pos --compare before.json
+#   python replay_benchmark.py drawer --source money_drawer_detection/data
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DRAWER_DIR = os.path.join(ROOT, "money_drawer_detection")
+CASHIER_DIR = os.path.join(ROOT, "cashier_monitoring")
+sys.path.extend([DRAWER_DIR, CASHIER_DIR])
+
+CLIP = os.path.join(DRAWER_DIR, "raw_theft_video.mp4")
+SUITES = {
+    # suite: default source
+    "pos": CLIP,
+    "drawer": CLIP,
+    "face": os.path.join(CASHIER_DIR, "dataset"),
+}
+
+
+def build_suite(name, clock):
+    """Returns (plugins, alerts, transform) wired to the replay clock, the same way the live nodes wire them."""
+    if name == "pos":
+        from pos_plugins import PosePlugin, ObjectPlugin
+        alerts = RecordingAlerts(clock, cooldown_seconds=10)
+        return [PosePlugin(alerts), ObjectPlugin(alerts)], alerts, None
+
+    if name == "drawer":
+        from drawer_logic import resize_to_standard
+        from drawer_plugin import DrawerPlugin
+        alerts = RecordingAlerts(clock, cooldown_seconds=0)
+        return [DrawerPlugin(alerts)], alerts, resize_to_standard
+
+    if name == "face":
+        from face_module.encoder import build_face_database
+        from face_module.recognizer import FaceRecognizer
+        from face_module.plugin import FacePlugin
+        database = build_face_database(os.path.join(CASHIER_DIR, "dataset"))
+        # Inline (no worker thread), so results don't depend on thread timing
+        recognizer = FaceRecognizer(database, background=False, clock=clock)
+        return [FacePlugin(recognizer)], None, None
+
+    raise ValueError(f"unknown suite {name!r}")
+
+
+def compare(result, baseline):
+    same = result["detections_digest"] == baseline["detections_digest"]
+    print(f"⚖️  vs baseline: {baseline['fps']:.1f} -> {result['fps']:.1f} fps "
+          f"({result['fps'] / max(baseline['fps'], 1e-9):.2f}x), "
+          f"p50 {baseline['latency_ms']['p50']:.1f} -> {result['latency_ms']['p50']:.1f} ms")
+    if same:
+        print("✅ Detections unchanged")
+    else:
+        print("❌ Detections differ from the baseline:")
+        for key in ("alerts_sent", "overlay_changes", "status_changes"):
+            if result[key] != baseline[key]:
+                print(f"   {key}: {len(baseline[key])} -> {len(result[key])} entries")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic replay benchmark for the edge detectors")
+    parser.add_argument("suite", choices=sorted(SUITES))
+    parser.add_argument("--source", help="Video file or image directory (default depends on the suite)")
+    parser.add_argument("--frames", type=int, help="Stop after this many frames")
+    parser.add_argument("--fps", type=float, default=30.0, help="Frame clock rate")
+    parser.add_argument("--no-encode", action="store_true", help="Leave JPEG encoding out of the timings")
+    parser.add_argument("--output", help="Write the full result JSON here")
+    parser.add_argument("--compare", help="Baseline result JSON from an earlier --output")
+    args = parser.parse_args()
+
+    clock = ReplayClock(fps=args.fps)
+    plugins, alerts, transform = build_suite(args.suite, clock)
+    source = args.source or SUITES[args.suite]
+
+    print(f"▶️  Replaying {source} through '{args.suite}' at a fixed {args.fps:g} fps clock")
+    result = replay(plugins, iter_frames(source, args.frames), clock, alerts=alerts,
+                    transform=transform, encode=not args.no_encode)
+    result.update(suite=args.suite, source=os.path.relpath(source, ROOT), clock_fps=args.fps)
+
+    latency = result["latency_ms"]
+    print(f"🎞️  {result['frames']} frames in {result['wall_s']:.1f}s = {result['fps']:.1f} fps | "
+          f"latency p50 {latency['p50']:.1f} / p90 {latency['p90']:.1f} / p99 {latency['p99']:.1f} ms")
+    for name, stats in sorted(result["stages"].items(), key=lambda kv: -kv[1].get("ms_per_frame", 0)):
+        if stats.get("count"):
+            print(f"   {name:<18} {stats['ms_per_frame']:7.2f} ms/frame | p95 {stats['p95_ms']:7.2f} ms | {stats['count']} calls")
+    print(f"🚨 {len(result['alerts_sent'])} alerts, {len(result['overlay_changes'])} overlay changes, "
+          f"{len(result['status_changes'])} status changes | digest {result['detections_digest'][:12]}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        print(f"💾 Saved {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            if not compare(result, json.load(f)):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The cashier and drawer code import their siblings as top-level modules, like their launchers do
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "cashier_monitoring"), os.path.join(ROOT, "money_drawer_detection")]
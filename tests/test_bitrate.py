@@ -0,0 +1,47 @@
+import pytest
+
+from edge_runtime.bitrate import BitrateController
+
+
+def test_starts_at_full_quality():
+    controller = BitrateController()
+    assert (controller.quality, controller.width, controller.fps) == (60, 640, 30.0)
+    assert controller.timeout == 0.5
+
+
+def test_failures_degrade_quality_before_resolution():
+    controller = BitrateController()
+    while controller.quality > controller.min_quality:
+        controller.record(0.05, ok=False)
+    assert controller.width == controller.max_width
+
+    while controller.level > 0.0:
+        controller.record(0.05, ok=False)
+    assert controller.width == controller.min_width
+    assert controller.fps == controller.min_fps
+    assert controller.failed > 0 and controller.sent == 0
+
+
+def test_fast_uploads_recover_additively():
+    controller = BitrateController()
+    controller.level = 0.5
+    controller.record(0.05, ok=True)
+    assert controller.level == pytest.approx(0.52)
+
+
+def test_slow_uploads_back_off_and_hold():
+    controller = BitrateController(target_latency=0.1)
+    controller.record(0.15, ok=True)  # Between target and 2x target
+    assert controller.level == 1.0
+    for _ in range(20):
+        controller.record(0.5, ok=True)
+    assert controller.level < 1.0
+    assert controller.timeout == pytest.approx(min(4 * controller.latency, controller.max_timeout))
+
+
+def test_fast_failure_does_not_move_the_timeout():
+    controller = BitrateController()
+    controller.record(0.1, ok=True)
+    timeout = controller.timeout
+    controller.record(0.001, ok=False)  # Connection refused
+    assert controller.timeout == timeout
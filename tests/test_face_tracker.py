@@ -0,0 +1,72 @@
+import numpy as np
+
+from face_module.face_tracker import FaceTrackPipeline
+
+FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+FACE = np.array([[200, 100, 300, 220]], dtype=np.float32)
+NO_FACE = np.zeros((0, 4), dtype=np.float32)
+
+
+def pipeline_with(detections):
+    pipeline = FaceTrackPipeline(detect_every=1)
+    results = iter(detections)
+    pipeline.detect = lambda frame: next(results)
+    return pipeline
+
+
+def test_identity_held_through_a_missed_detection():
+    pipeline = pipeline_with([FACE, NO_FACE, FACE])
+    track = pipeline.update(FRAME)[0]
+    pipeline.assign(track.track_id, "aditi", 0.1, now=0.0)
+
+    tracks = pipeline.update(FRAME)
+    assert [t.track_id for t in tracks] == [track.track_id]
+    assert pipeline.identities[track.track_id].person == "aditi"
+
+    assert pipeline.update(FRAME)[0].track_id == track.track_id
+
+
+def test_coasting_track_is_not_embedded():
+    pipeline = pipeline_with([FACE, NO_FACE])
+    pipeline.update(FRAME)
+    assert len(pipeline.needs_embedding(now=0.0)) == 1
+    pipeline.update(FRAME)
+    assert pipeline.needs_embedding(now=0.0) == []
+
+
+def test_identity_forgotten_once_track_is_dropped():
+    pipeline = pipeline_with([FACE] + [NO_FACE] * 6)
+    track = pipeline.update(FRAME)[0]
+    pipeline.assign(track.track_id, "aditi", 0.1, now=0.0)
+    for _ in range(6):
+        tracks = pipeline.update(FRAME)
+    assert tracks == []
+    assert pipeline.identities == {}
+
+
+def test_confidence_decays_with_half_life():
+    pipeline = pipeline_with([FACE])
+    track = pipeline.update(FRAME)[0]
+    pipeline.assign(track.track_id, "aditi", 0.0, now=0.0)
+    assert pipeline.confidence(track.track_id, now=0.0) == 1.0
+    assert abs(pipeline.confidence(track.track_id, now=pipeline.half_life) - 0.5) < 1e-9
+
+
+NEXT_CASHIER = np.array([[320, 60, 480, 260]], dtype=np.float32)  # Larger, so it becomes the primary face
+
+
+def test_primary_identity_pending_after_handover():
+    pipeline = pipeline_with([FACE, NEXT_CASHIER, NEXT_CASHIER])
+    first = pipeline.update(FRAME)[0]
+    pipeline.assign(first.track_id, "aditi", 0.1, now=0.0)
+    assert pipeline.primary_identity().person == "aditi"
+
+    tracks = pipeline.update(FRAME)
+    assert len(tracks) == 2  # The first cashier's track is still coasting
+    assert pipeline.primary_track().track_id != first.track_id
+    assert pipeline.primary_identity() is None
+
+    second = pipeline.primary_track()
+    pipeline.assign(second.track_id, "bilal", 0.1, now=1.0)
+    pipeline.update(FRAME)
+    assert pipeline.primary_identity().person == "bilal"
@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("mediapipe")
+pytest.importorskip("ultralytics")
+
+from forensic_batch import build_timeline
+
+
+def test_runs_merge_across_consecutive_frames():
+    records = [(0, True, 20), (1, True, 20), (2, False, None)]
+    timeline = build_timeline(records, fps=10.0)
+    assert timeline["drawer_open"] == [{"start_frame": 0, "end_frame": 1, "start_s": 0.0, "end_s": 0.1}]
+    assert [e["value"] for e in timeline["hand_in_slot"]] == [20]
+    assert timeline["missing_frames"] == []
+
+
+def test_gap_ends_open_runs():
+    # A chunk stopped early: frames 2-4 were never decoded
+    records = [(0, True, 20), (1, True, 20), (5, True, 20), (6, False, None)]
+    timeline = build_timeline(records, fps=10.0)
+    assert [(e["start_frame"], e["end_frame"]) for e in timeline["drawer_open"]] == [(0, 1), (5, 5)]
+    assert [(e["start_frame"], e["end_frame"]) for e in timeline["hand_in_slot"]] == [(0, 1), (5, 5)]
+    assert timeline["missing_frames"] == [{"start_frame": 2, "end_frame": 4}]
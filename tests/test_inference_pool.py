@@ -0,0 +1,60 @@
+import time
+
+from edge_runtime.inference_pool import FairFrameQueue, InferencePool
+
+
+def test_queue_serves_cameras_round_robin():
+    queue = FairFrameQueue(per_camera=3)
+    for i in range(3):
+        queue.put(1, f"a{i}")
+    queue.put(2, "b0")
+
+    batch = queue.take({1, 2}, 3)
+    assert batch == [(1, "a0"), (2, "b0"), (1, "a1")]
+    assert queue.take({1, 2}, 3) == [(1, "a2")]
+    assert queue.take({1, 2}, 3) == []
+
+
+def test_queue_only_serves_requested_cameras():
+    queue = FairFrameQueue()
+    queue.put(1, "a")
+    queue.put(2, "b")
+    assert queue.take({2}, 4) == [(2, "b")]
+    assert queue.depth() == 1
+
+
+def test_fast_camera_drops_only_its_own_oldest():
+    queue = FairFrameQueue(per_camera=2)
+    queue.put(2, "b0")
+    assert queue.put(1, "a0") and queue.put(1, "a1")
+    assert not queue.put(1, "a2")
+
+    assert queue.dropped[1] == 1 and queue.dropped[2] == 0
+    assert queue.depth(1) == 2 and queue.depth(2) == 1
+    assert sorted(queue.take({1, 2}, 4)) == [(1, "a1"), (1, "a2"), (2, "b0")]
+
+
+def wait_for(condition, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_dead_worker_is_restarted():
+    pool = InferencePool({1: []}, "http://127.0.0.1:9", workers=1)
+    pool.RESTART_BACKOFF_SECONDS = 0.1
+    try:
+        worker = pool.workers[0]
+        assert wait_for(worker.process.is_alive)
+        worker.process.kill()
+        with pool.lock:
+            worker.inflight = pool.max_inflight  # As if it died holding batches
+
+        assert wait_for(lambda: worker.restarts == 1 and worker.process.is_alive())
+        assert worker.inflight == 0
+        assert pool.stats()["workers"][0]["restarts"] == 1
+    finally:
+        pool.close()
@@ -0,0 +1,76 @@
+import numpy as np
+
+from pose_features import (L_HIP, L_SHOULDER, L_WRIST, NOSE, R_HIP, R_SHOULDER, R_WRIST, PoseHistory,
+                           PoseTracker, is_looking_around, is_touching_pocket, side_crossings)
+
+
+def pose(x=0.5, look=0.0, pocket=False):
+    """A standing person centred on `x`, nose shifted by `look` shoulder widths."""
+    p = np.zeros((33, 2), dtype=np.float32)
+    p[:, 0] = x + np.linspace(-0.08, 0.08, 33)
+    p[:, 1] = np.linspace(0.2, 0.9, 33)
+    p[L_SHOULDER], p[R_SHOULDER] = (x - 0.05, 0.4), (x + 0.05, 0.4)
+    p[L_HIP], p[R_HIP] = (x - 0.04, 0.7), (x + 0.04, 0.7)
+    p[NOSE] = (x + look * 0.1, 0.3)
+    p[L_WRIST] = (x - 0.2, 0.5)
+    p[R_WRIST] = (x + 0.04, 0.72) if pocket else (x + 0.2, 0.5)
+    return p
+
+
+def history_of(poses, fps):
+    history = PoseHistory(capacity=64)
+    for i, p in enumerate(poses):
+        history.append(p, i / fps)
+    return history, (len(poses) - 1) / fps
+
+
+def test_looking_around_fires_on_most_of_the_window():
+    history, now = history_of([pose(look=0.5)] * 14 + [pose()] + [pose(look=0.5)] * 2, fps=30)
+    assert is_looking_around(history, now)
+    history, now = history_of([pose()] * 17, fps=30)
+    assert not is_looking_around(history, now)
+
+
+def test_windows_are_time_based_at_idle_cadence():
+    # 3 fps: the half-second window holds two samples, not fifteen
+    history, now = history_of([pose()] * 5 + [pose(look=0.5)] * 2, fps=3)
+    assert is_looking_around(history, now)
+    history, now = history_of([pose()] * 6 + [pose(look=0.5)], fps=3)
+    assert not is_looking_around(history, now)
+
+
+def test_pocket_touching():
+    history, now = history_of([pose(pocket=True)] * 20, fps=30)
+    assert is_touching_pocket(history, now)
+    history, now = history_of([pose()] * 20, fps=30)
+    assert not is_touching_pocket(history, now)
+
+
+def test_side_crossings_ignore_deadband():
+    xs = [0.3, 0.49, 0.51, 0.3, 0.7, 0.3, 0.7]
+    history, _ = history_of([pose(x) for x in xs], fps=1)
+    assert side_crossings(history, start=0) == 3
+    assert side_crossings(history, start=5) == 1
+
+
+def test_ring_buffer_wraps():
+    history, now = history_of([pose(0.3)] * 70 + [pose(look=0.5)] * 20, fps=30)
+    assert history.count == 90
+    assert np.allclose(history.latest, pose(look=0.5))
+    assert is_looking_around(history, now)
+
+
+def test_tracked_person_survives_a_missed_pose():
+    tracker = PoseTracker(max_misses=2)
+    people = tracker.update([pose(0.3), pose(0.7)], 640, 480, now=0.0)
+    ids = sorted(person_id for person_id, _ in people)
+
+    people = tracker.update([pose(0.3)], 640, 480, now=0.1)
+    assert sorted(person_id for person_id, _ in people) == ids
+    history = dict(people)[ids[1]]
+    assert history.count == 1  # The missed frame adds nothing to their history
+
+    for t in (0.2, 0.3):
+        people = tracker.update([pose(0.3)], 640, 480, now=t)
+    assert [person_id for person_id, _ in people] == [ids[0]]
+    assert ids[1] not in tracker.histories
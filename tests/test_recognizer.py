@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("deepface")
+
+from face_module.recognizer import FaceRecognizer
+
+FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+FACE = np.array([[200, 100, 300, 220]], dtype=np.float32)
+NEXT_CASHIER = np.array([[320, 60, 480, 260]], dtype=np.float32)
+
+
+def test_handover_shows_pending_not_previous_cashier():
+    recognizer = FaceRecognizer({}, background=False, register="default", clock=lambda: 0.0)
+    detections = iter([FACE, NEXT_CASHIER])
+    recognizer.face_tracks.detect_every = 1
+    recognizer.face_tracks.detect = lambda frame: next(detections)
+    recognizer._status_for = lambda person: (person, "AUTHORIZED")
+    recognizer.embed_tracks = lambda job: [(track_id, "aditi", 0.1) for track_id, _ in job]
+
+    _, status = recognizer.recognize_faces(FRAME.copy(), now=0.0)
+    assert (recognizer.last_detected_person, status) == ("aditi", "AUTHORIZED")
+
+    # The next cashier steps in while the first one's track is still coasting; their embedding is pending
+    recognizer.embed_tracks = lambda job: []
+    _, status = recognizer.recognize_faces(FRAME.copy(), now=0.1)
+    assert (recognizer.last_detected_person, status) == (None, "SCANNING...")
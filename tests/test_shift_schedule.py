@@ -0,0 +1,58 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from config.shift_schedule import ShiftSchedule, compile_roster
+
+MONDAY = datetime(2024, 1, 1)
+
+
+def at(hour, minute=0, day=0):
+    return MONDAY.replace(day=1 + day, hour=hour, minute=minute)
+
+
+def write_roster(path, entries):
+    path.write_text(json.dumps({"registers": {"default": entries}}))
+    return str(path)
+
+
+def test_compile_roster_ends_are_inclusive():
+    index = compile_roster({"default": [{"days": "daily", "time": "09:00-13:00", "person": "aditi"}]})
+    breakpoints, on_duty = index[("default", 0)]
+    assert breakpoints == [0, 9 * 60, 13 * 60 + 1]
+    assert on_duty == [(), ("aditi",), ()]
+
+
+@pytest.mark.parametrize("entry", [
+    {"time": "0900-1300", "person": "aditi"},
+    {"days": ["funday"], "time": "09:00-13:00", "person": "aditi"},
+    {"time": "09:00-13:00"},
+    {"days": 5, "time": "09:00-13:00", "person": "aditi"},
+])
+def test_compile_roster_rejects_bad_entries(entry):
+    with pytest.raises((ValueError, KeyError, TypeError, AttributeError)):
+        compile_roster({"default": [entry]})
+
+
+def test_overnight_shift_runs_into_next_day(tmp_path):
+    schedule = ShiftSchedule(write_roster(tmp_path / "shifts.json", [
+        {"days": ["mon"], "time": "22:00-02:00", "person": "raj"}]))
+    assert schedule.is_authorized("raj", when=at(23))
+    assert schedule.is_authorized("Raj", when=at(1, day=1))
+    assert not schedule.is_authorized("raj", when=at(3, day=1))
+
+
+@pytest.mark.parametrize("broken", [
+    [{"days": "daily", "time": "0900-1300", "person": "aadil"}],
+    [{"days": ["funday"], "time": "09:00-13:00", "person": "aadil"}],
+])
+def test_bad_roster_keeps_last_good_one(tmp_path, broken):
+    path = write_roster(tmp_path / "shifts.json", [{"days": "daily", "time": "09:00-13:00", "person": "aditi"}])
+    schedule = ShiftSchedule(path, reload_interval=0)
+
+    write_roster(tmp_path / "shifts.json", broken)
+    os.utime(path, (0, 0))  # New mtime, so the next lookup reloads
+    assert schedule.authorized(when=at(10)) == ("aditi",)
+    assert schedule.authorized(when=at(10)) == ("aditi",)
@@ -0,0 +1,84 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from utils.snapshot_store import SnapshotStore, dhash, hamming
+
+T0 = 1_700_000_000.0
+
+
+def scene(seed):
+    """A smooth random picture, so its hash reflects layout rather than pixel noise."""
+    coarse = np.random.default_rng(seed).integers(0, 255, (6, 8, 3), dtype=np.uint8)
+    return cv2.resize(coarse, (320, 240), interpolation=cv2.INTER_CUBIC)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(str(tmp_path), max_mb=10, max_age_days=1)
+    yield store
+    store.close()
+
+
+def test_dhash_tolerates_noise_but_not_a_new_scene():
+    image = scene(0)
+    noisy = np.clip(image.astype(int) + np.random.default_rng(1).integers(-4, 4, image.shape), 0, 255).astype(np.uint8)
+    assert hamming(dhash(image), dhash(noisy)) <= 6
+    assert hamming(dhash(image), dhash(scene(2))) > 6
+
+
+def test_duplicates_are_counted_not_written(store, tmp_path):
+    row = store.save(scene(0), person="raj", expected="aditi", now=T0)
+    assert row is not None
+    assert os.path.exists(tmp_path / row["path"])
+    assert os.path.exists(tmp_path / row["thumb"])
+
+    for i in range(1, 30):
+        assert store.save(scene(0), person="raj", now=T0 + i) is None
+    assert store.save(scene(5), person="raj", now=T0 + 31) is not None
+
+    rows = store.query(person="raj")
+    assert [r["repeats"] for r in rows] == [0, 29]
+    assert rows[1]["last_ts"] == T0 + 29
+
+
+def test_repeats_stay_in_memory_until_flush(store):
+    row = store.save(scene(0), person="raj", now=T0)
+    store.maybe_flush(T0)
+    for i in range(1, 5):
+        store.save(scene(0), person="raj", now=T0 + i)
+    on_disk = store.db.execute("SELECT repeats FROM snapshots WHERE id = ?", (row["id"],)).fetchone()[0]
+    assert on_disk == 0
+
+    store.maybe_flush(T0 + store.flush_seconds)
+    on_disk = store.db.execute("SELECT repeats FROM snapshots WHERE id = ?", (row["id"],)).fetchone()[0]
+    assert on_disk == 4
+
+
+def test_query_filters(store):
+    store.save(scene(0), person="raj", camera="a", now=T0)
+    store.save(scene(1), person="amit", camera="b", now=T0 + 10)
+    assert [r["person"] for r in store.query(camera="b")] == ["amit"]
+    assert [r["person"] for r in store.query(since=T0 + 5)] == ["amit"]
+    assert [r["person"] for r in store.query(until=T0 + 5)] == ["raj"]
+
+
+def test_age_retention(store, tmp_path):
+    old = store.save(scene(0), person="raj", now=T0)
+    store.save(scene(1), person="raj", now=T0 + 2 * 86400)
+    assert [r["id"] for r in store.query()] != [old["id"]]
+    assert len(store.query()) == 1
+    assert not os.path.exists(tmp_path / old["path"])
+
+
+def test_size_retention_keeps_newest(store):
+    first = store.save(scene(0), person="p0", now=T0)
+    store.max_bytes = int(first["bytes"] * 3.5)
+    for i in range(1, 6):
+        store.save(scene(i), person=f"p{i}", now=T0 + i)
+    people = [r["person"] for r in store.query()]
+    assert people[0] == "p5"
+    assert 0 < len(people) < 6
+    assert store.total_bytes <= store.max_bytes
@@ -0,0 +1,56 @@
+import numpy as np
+
+from edge_runtime.tracking import BoxTracker, iou_matrix
+
+BOX = [100, 100, 200, 200]
+
+
+def detect(tracker, *boxes):
+    return tracker.update(np.array(boxes, dtype=np.float32).reshape(-1, 4), np.ones(len(boxes)), np.zeros(len(boxes), dtype=int))
+
+
+def test_iou_matrix():
+    iou = iou_matrix(np.array([BOX, [0, 0, 10, 10]], dtype=np.float32), np.array([BOX], dtype=np.float32))
+    assert iou.shape == (2, 1)
+    assert iou[0, 0] == 1.0
+    assert iou[1, 0] == 0.0
+
+
+def test_track_keeps_its_id():
+    tracker = BoxTracker(max_misses=3)
+    first = detect(tracker, BOX)[0]
+    second = detect(tracker, [105, 102, 205, 202])[0]
+    assert second.track_id == first.track_id
+    assert second.matched
+
+
+def test_missed_track_coasts_until_max_misses():
+    tracker = BoxTracker(max_misses=2)
+    track_id = detect(tracker, BOX)[0].track_id
+
+    for _ in range(2):
+        tracks = detect(tracker)
+        assert [t.track_id for t in tracks] == [track_id]
+        assert not tracks[0].matched
+
+    assert detect(tracker) == []
+
+
+def test_predict_returns_coasting_tracks_unmatched():
+    tracker = BoxTracker(max_misses=3)
+    detect(tracker, BOX)
+    tracks = tracker.predict()
+    assert len(tracks) == 1
+    assert not tracks[0].matched
+
+
+def test_low_score_detection_cannot_start_a_track():
+    tracker = BoxTracker(high_score=0.5)
+    assert tracker.update(np.array([BOX], dtype=np.float32), np.array([0.3]), np.array([0])) == []
+
+
+def test_track_never_changes_class():
+    tracker = BoxTracker()
+    tracker.update(np.array([BOX], dtype=np.float32), np.array([0.9]), np.array([0]))
+    tracks = tracker.update(np.array([BOX], dtype=np.float32), np.array([0.9]), np.array([1]))
+    assert sorted(t.label for t in tracks) == [0, 1]